@@ -0,0 +1,142 @@
+"""
+Micro benchmarks for Jot operations.
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_jot.py
+"""
+import io
+import json
+import timeit
+import tracemalloc
+from typing import Any, Dict
+
+from plexiglass.jot import dump, dumps, Jot, loads, unpack
+
+
+def make_tree(width: int, depth: int) -> Jot:
+    """Build a Jot with `width` keys per node, nested `depth` levels deep."""
+    root = Jot()
+    nodes = [root]
+    for level in range(depth):
+        children = []
+        for node in nodes:
+            for i in range(width):
+                if level == depth - 1:
+                    node[f"key{i}"] = i
+                else:
+                    node[f"key{i}"] = Jot()
+                    children.append(node[f"key{i}"])
+        nodes = children
+    return root
+
+
+def bench_overlay(number: int = 200) -> None:
+    """Derive a small overlay from bases of increasing size."""
+    overlay = {"key0": {"key0": {"key0": "overlay"}}, "extra": [1, 2, 3]}
+    print("overlay: base size -> full copy vs copy-on-write (usec per derive)")
+    for width in (4, 8, 16, 24):
+        base = make_tree(width, 3)
+        size = width + width ** 2 + width ** 3
+        full = timeit.timeit(lambda: base(overlay), number=number) / number
+        cow = timeit.timeit(lambda: base(overlay, cow=True), number=number) / number
+        print(f"  {size:>8} keys  {full * 1e6:>12.1f}  {cow * 1e6:>10.1f}")
+
+
+def bench_merge(number: int = 20) -> None:
+    """Load wide and deep documents into a Jot."""
+    wide = {f"key{i}": {f"key{j}": [j, {"value": j}] for j in range(50)} for i in range(200)}
+    deep: Dict[str, Any] = {}
+    node = deep
+    for i in range(5000):
+        node["next"] = {"value": i}
+        node = node["next"]
+
+    print("merge: document -> usec per Jot(document)")
+    for name, document in (("wide", wide), ("deep", deep)):
+        elapsed = timeit.timeit(lambda: Jot(document), number=number) / number
+        print(f"  {name:>8}  {elapsed * 1e6:>12.1f}")
+
+
+def bench_merge_lists(number: int = 5) -> None:
+    """Merge documents holding large lists into a Jot under each list strategy."""
+    print("merge lists: list length -> usec per merge for each strategy")
+    strategies = ("replace", "reference", "append", "union")
+    print(f"  {'':>8}  " + "  ".join(f"{strategy:>10}" for strategy in strategies))
+    for length in (1000, 100000, 500000):
+        document = {"samples": {"hashes": [f"{i:064x}" for i in range(length)]}}
+        timings = []
+        for strategy in strategies:
+            j = Jot({"samples": {"hashes": []}})
+            elapsed = timeit.timeit(lambda: j.merge(document, lists=strategy), number=number) / number
+            timings.append(f"{elapsed * 1e6:>10.1f}")
+        print(f"  {length:>8}  " + "  ".join(timings))
+
+
+class Discard(io.TextIOBase):
+    """A file-like object that throws away everything written to it."""
+
+    def write(self, chunk: str) -> int:
+        return len(chunk)
+
+
+def bench_dump() -> None:
+    """Compare peak memory and time of serializing a large Jot."""
+    base = make_tree(24, 3)
+    print("dump: method -> peak KiB, msec")
+    methods = (
+        ("unpack", lambda: json.dumps(unpack(base))),
+        ("repr", lambda: repr(base)),
+        ("dumps", lambda: dumps(base)),
+        ("dump", lambda: dump(base, Discard())),
+    )
+    for name, method in methods:
+        tracemalloc.start()
+        start = timeit.default_timer()
+        method()
+        elapsed = timeit.default_timer() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {name:>8}  {peak / 1024:>10.1f}  {elapsed * 1e3:>8.1f}")
+
+
+def bench_load() -> None:
+    """Compare peak memory of eager and lazy loading when a few keys are read."""
+    document = dumps(make_tree(24, 3))
+    print("load: method -> peak KiB, msec")
+    methods = (("eager", lambda: Jot(document).key0.key1.key2), ("lazy", lambda: loads(document).key0.key1.key2))
+    for name, method in methods:
+        tracemalloc.start()
+        start = timeit.default_timer()
+        method()
+        elapsed = timeit.default_timer() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {name:>8}  {peak / 1024:>10.1f}  {elapsed * 1e3:>8.1f}")
+
+
+def bench_paths(number: int = 200000) -> None:
+    """Compare attribute chaining with compiled path lookups."""
+    cfg = Jot({"services": {"redis": {"host": "127.0.0.1", "port": 6379}}})
+    strict = Jot(cfg, auto=False)
+    paths = ["services.redis.host", "services.redis.port", "services.nats.host"]
+    print("paths: method -> nsec per lookup")
+    methods = (
+        ("attr hit", lambda: cfg.services.redis.host),
+        ("get_path hit", lambda: cfg.get_path("services.redis.host")),
+        ("getattr miss", lambda: getattr(strict, "missing", None)),
+        ("get_path miss", lambda: strict.get_path("services.redis.missing")),
+        ("get_paths x3", lambda: cfg.get_paths(paths)),
+    )
+    for name, method in methods:
+        elapsed = min(timeit.repeat(method, number=number, repeat=5)) / number
+        print(f"  {name:>14}  {elapsed * 1e9:>8.1f}")
+
+
+if __name__ == "__main__":
+    bench_overlay()
+    bench_merge()
+    bench_merge_lists()
+    bench_dump()
+    bench_load()
+    bench_paths()
@@ -0,0 +1,146 @@
+"""
+Benchmarks for the logging pipeline.
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_logging.py
+"""
+import io
+import logging
+import sys
+import time
+from typing import List
+
+import structlog
+
+from plexiglass import argparse_config, log_filters, log_queue, logging_config
+
+
+class NullStream(io.TextIOBase):
+    """A stream that discards what is written to it."""
+
+    def write(self, chunk: str) -> int:
+        return len(chunk)
+
+
+class SlowStream(io.TextIOBase):
+    """A stream whose writes stall, like stderr under back-pressure from a log collector."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def write(self, chunk: str) -> int:
+        time.sleep(self.delay)
+        return len(chunk)
+
+
+def percentiles(timings: List[float]) -> str:
+    timings = sorted(timings)
+    picks = [timings[int(len(timings) * p)] for p in (0.5, 0.99)] + [timings[-1]]
+    return "  ".join(f"{t * 1e6:>10.1f}" for t in picks)
+
+
+def bench_queue(number: int = 2000, delay: float = 0.0002) -> None:
+    """Compare calling-thread latency of writing logs directly and through the queue."""
+    logger = logging.getLogger("bench")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    print(f"queue: mode -> usec per call on the calling thread (p50, p99, max), {delay * 1e6:.0f} usec writes")
+    modes = (("direct", None, 0), ("block", "block", 10000), ("drop-newest", "drop-newest", 100))
+    for name, overflow, size in modes:
+        logger.handlers = [logging.StreamHandler(SlowStream(delay))]
+        if overflow:
+            handler = log_queue.start(logger, size=size, overflow=overflow)
+        timings = []
+        for i in range(number):
+            start = time.perf_counter()
+            logger.info("event %d", i)
+            timings.append(time.perf_counter() - start)
+        dropped = handler.dropped if overflow else 0
+        log_queue.stop()
+        print(f"  {name:>12}  {percentiles(timings)}  dropped {dropped}")
+
+
+def configure_stdlib_chain() -> None:
+    """Configure structlog the way --jsonl did before rendering lines directly."""
+    structlog.configure(
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper("iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(),
+        ],
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=False,
+    )
+
+
+def bench_jsonl(number: int = 50000) -> None:
+    """Compare JSONL throughput through the stdlib handlers and written directly."""
+    parser = argparse_config.make_parser()
+    logging_config.configure_parser(parser)
+    cli_args = parser.parse_args(["-v", "--jsonl"])
+
+    print("jsonl: pipeline -> logs per second")
+    stderr, sys.stderr = sys.stderr, NullStream()
+    try:
+        for name in ("stdlib chain", "direct"):
+            logging_config.configure_logging(cli_args)
+            if name == "stdlib chain":
+                configure_stdlib_chain()
+            log = structlog.get_logger("bench_jsonl")
+            start = time.perf_counter()
+            for i in range(number):
+                log.info("event", index=i, user="someone", ratio=0.5)
+            rate = number / (time.perf_counter() - start)
+            print(f"  {name:>12}  {rate:>10.0f}", file=stderr)
+    finally:
+        sys.stderr = stderr
+
+
+def bench_disabled(number: int = 1000000) -> None:
+    """Time a debug call that is dropped at the default WARNING level."""
+    parser = argparse_config.make_parser()
+    logging_config.configure_parser(parser)
+
+    print("disabled: logger -> nsec per log.debug call at WARNING")
+    for name in ("stdlib BoundLogger", "no-op levels"):
+        logging_config.configure_logging(parser.parse_args(["--jsonl"]))
+        if name == "stdlib BoundLogger":
+            structlog.configure(wrapper_class=structlog.stdlib.BoundLogger)
+        log = structlog.get_logger("bench_disabled").bind(user="someone")
+        start = time.perf_counter()
+        for i in range(number):
+            log.debug("event", index=i)
+        print(f"  {name:>18}  {(time.perf_counter() - start) / number * 1e9:>8.1f}")
+
+
+def bench_flow_control(number: int = 200000) -> None:
+    """Time each flow control processor on a flood of the same event."""
+    logger = logging.getLogger("bench_flow_control")
+    processors = (
+        ("sampler", log_filters.Sampler({"error": 0.01})),
+        ("rate limiter", log_filters.RateLimiter(rate=10, burst=10)),
+        ("deduplicator", log_filters.Deduplicator(window=5)),
+    )
+    print("flow control: processor -> nsec per event")
+    for name, processor in processors:
+        start = time.perf_counter()
+        for i in range(number):
+            try:
+                processor(logger, "error", {"event": "upstream down", "level": "error", "host": "a"})
+            except structlog.DropEvent:
+                pass
+        print(f"  {name:>12}  {(time.perf_counter() - start) / number * 1e9:>8.1f}")
+
+
+if __name__ == "__main__":
+    bench_queue()
+    bench_jsonl()
+    bench_disabled()
+    bench_flow_control()
@@ -0,0 +1,35 @@
+"""
+Compare the memory used by many small Jots with generated record classes.
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_record.py [count]
+"""
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, List
+
+from plexiglass.jot import Jot
+from plexiglass.record import make_record
+
+
+def measure(name: str, build: Callable[[int], Any], count: int) -> None:
+    tracemalloc.start()
+    start = timeit.default_timer()
+    items: List[Any] = [build(i) for i in range(count)]
+    elapsed = timeit.default_timer() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"  {name:>8}  {size / 2 ** 20:>10.1f}  {size / len(items):>10.1f}  {elapsed:>8.2f}")
+
+
+def bench_memory(count: int) -> None:
+    Sample = make_record("Sample", ["sha256", "size", "source"])
+    print(f"memory: {count} items -> MiB, bytes per item, sec")
+    measure("jot", lambda i: Jot({"sha256": "", "size": i, "source": "feed"}), count)
+    measure("record", lambda i: Sample({"sha256": "", "size": i, "source": "feed"}), count)
+
+
+if __name__ == "__main__":
+    bench_memory(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,72 @@
+"""
+Startup benchmarks for short-lived tools that configure every integration.
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_startup.py
+"""
+import os
+import subprocess
+import sys
+import timeit
+from typing import List
+
+from plexiglass import argparse_config, logging_config
+
+CONFIGS = ["dgraph", "hashi", "nats", "redis", "sonic", "synapse", "tracing"]
+
+SETUP = f"""
+from plexiglass import argparse_config, logging_config, {", ".join(f"{name}_config" for name in CONFIGS)}
+"""
+
+TOOL = """
+def parse(lazy, argv):
+    parser = argparse_config.make_parser("TOOL")
+    logging_config.configure_parser(parser)
+    dgraph_config.configure_parser(parser, lazy=lazy)
+    hashi_config.configure_parser(parser, consul=True, nomad=True, lazy=lazy)
+    nats_config.configure_parser(parser, lazy=lazy)
+    redis_config.configure_parser(parser, lazy=lazy)
+    sonic_config.configure_parser(parser, lazy=lazy)
+    synapse_config.configure_parser(parser, synapse=True, lazy=lazy)
+    tracing_config.configure_parser(parser, lazy=lazy)
+    return parser.parse_args(argv)
+"""
+
+
+def run(code: str, number: int) -> float:
+    """Time fresh interpreters running `code`, in msec per process."""
+    command = [sys.executable, "-c", code]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    elapsed = timeit.timeit(lambda: subprocess.run(command, check=True, env=env), number=number)
+    return elapsed / number * 1e3
+
+
+def bench_import(number: int = 20) -> None:
+    """Compare process startup with and without importing and parsing."""
+    print("startup: process -> msec per process")
+    cases = (
+        ("python", "pass"),
+        ("import", SETUP),
+        ("parse eager", SETUP + TOOL + "parse(False, ['--nats-host', 'x'])"),
+        ("parse lazy", SETUP + TOOL + "parse(True, ['--nats-host', 'x'])"),
+    )
+    for name, code in cases:
+        print(f"  {name:>12}  {run(code, number):>8.1f}")
+
+
+def bench_parse(number: int = 500) -> None:
+    """Build a parser with every integration and parse a command line, in process."""
+    namespace: dict = {"argparse_config": argparse_config, "logging_config": logging_config}
+    exec(SETUP + TOOL, namespace)
+    argvs: List[List[str]] = [[], ["--nats-host", "x"]]
+    print("parse: argv -> usec per parser, eager vs lazy")
+    for argv in argvs:
+        eager = timeit.timeit(lambda: namespace["parse"](False, argv), number=number) / number
+        lazy = timeit.timeit(lambda: namespace["parse"](True, argv), number=number) / number
+        print(f"  {' '.join(argv) or '(none)':>16}  {eager * 1e6:>10.1f}  {lazy * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    bench_import()
+    bench_parse()
@@ -0,0 +1,78 @@
+"""
+Benchmarks for the timers.
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_time.py
+"""
+from contextlib import ExitStack
+import time
+import timeit
+
+from plexiglass import time as plexiglass_time
+from plexiglass.time import Deadline, timer, Timeout
+
+
+def bench_timer(number: int = 500000) -> None:
+    """Time the overhead of one measurement, with nothing inside the timer."""
+    record = plexiglass_time.histogram("bench.record").record
+
+    def unnamed() -> None:
+        with timer():
+            pass
+
+    def named() -> None:
+        with timer("bench.named"):
+            pass
+
+    class Empty:
+        def __enter__(self) -> None:
+            time.perf_counter()
+
+        def __exit__(self, *exc_info: object) -> None:
+            time.perf_counter()
+
+    empty = Empty()
+
+    def floor() -> None:
+        with empty:
+            pass
+
+    print("timer: measurement -> nsec per measurement")
+    cases = (
+        ("clocks only", floor),
+        ("unnamed timer", unnamed),
+        ("named timer", named),
+        ("record", lambda: record(0.001)),
+    )
+    for name, func in cases:
+        print(f"  {name:>14}  {timeit.timeit(func, number=number) / number * 1e9:>8.1f}")
+    print(f"  {'snapshot':>14}  {timeit.timeit(plexiglass_time.snapshot, number=100) / 100 * 1e9:>8.1f}")
+
+
+def bench_deadline(number: int = 20000) -> None:
+    """Time entering and leaving deadlines that do not expire."""
+
+    def deadline() -> None:
+        with Deadline(60):
+            pass
+
+    def timeout() -> None:
+        with Timeout(60):
+            pass
+
+    print("deadline: case -> usec per deadline")
+    for name, func in (("Timeout", timeout), ("Deadline", deadline)):
+        print(f"  {name:>20}  {timeit.timeit(func, number=number) / number * 1e6:>8.2f}")
+
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        for i in range(number):
+            stack.enter_context(Deadline(2 * number - i))
+        entered = time.perf_counter()
+    print(f"  {f'{number} outstanding':>20}  {(entered - start) / number * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    bench_timer()
+    bench_deadline()
@@ -0,0 +1,38 @@
+"""
+Benchmarks for ID generation.
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_uuid.py
+"""
+from pathlib import Path
+import tempfile
+import timeit
+
+from plexiglass.uuid import get_sortable_id, get_sortable_ids, get_uuid
+
+
+def bench_ids(number: int = 100000, batch: int = 1000) -> None:
+    """Compare generating random and sortable IDs, one at a time and in batches."""
+    print("ids: generator -> usec per ID")
+    cases = (
+        ("uuid4", get_uuid, number),
+        ("sortable", get_sortable_id, number),
+        (f"sortable x{batch}", lambda: get_sortable_ids(batch), number // batch),
+    )
+    for name, func, calls in cases:
+        per_id = timeit.timeit(func, number=calls) / number
+        print(f"  {name:>14}  {per_id * 1e6:>8.3f}")
+
+
+def bench_owner_id(number: int = 10000) -> None:
+    """Time looking up the owner ID of a workspace."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "uuid"
+        elapsed = timeit.timeit(lambda: get_uuid(path), number=number)
+    print(f"owner id: usec per lookup  {elapsed / number * 1e6:>8.3f}")
+
+
+if __name__ == "__main__":
+    bench_ids()
+    bench_owner_id()
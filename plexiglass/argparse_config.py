@@ -2,17 +2,185 @@
 Monkey Patch the argparse ActionContainer classes to support automatically using
 an inferred environment variable to supply default values.
 
+Defaults can additionally be layered from `.env`, JSON and TOML files, which
+are consulted after the environment and before the default of each argument.
+
 Here there be dragons...
 """
 import argparse
 from contextlib import suppress
+import json
 import os
+from pathlib import Path
 import sys
-from typing import Any, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from plexiglass.jot import FrozenJot, Jot
 
 
 _MODIFIED = False
 
+# Parsed sources by path, along with the (mtime, size) stamp they were parsed at.
+_SOURCES: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+# Parsed sources are also cached on disk for other processes reading the same
+# file, in a per-user directory under the temporary directory by default.
+_CACHE_DIR: Optional[Path] = None
+
+
+def _cache_dir() -> Path:
+    import getpass
+    import tempfile
+
+    if _CACHE_DIR is not None:
+        return _CACHE_DIR
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        # Containers may run as a user with no name at all.
+        user = str(os.getuid())
+    return Path(tempfile.gettempdir()) / f"plexiglass-cache-{user}"
+
+
+def _trusted(path: Path) -> bool:
+    """
+    Whether a cache directory or file is owned by this user, is not a symlink
+    and cannot be written to by anyone else.
+    """
+    import stat
+
+    info = os.lstat(path)
+    if not (stat.S_ISDIR(info.st_mode) or stat.S_ISREG(info.st_mode)):
+        return False
+    return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _read_cache(path: Path) -> bytes:
+    """Read a file from the cache directory, raising a PermissionError if it cannot be trusted."""
+    if not (_trusted(path.parent) and _trusted(path)):
+        raise PermissionError(path)
+    return path.read_bytes()
+
+
+def _write_cache(path: Path, data: bytes) -> None:
+    """Atomically replace a file in the cache directory."""
+    import tempfile
+
+    path.parent.mkdir(mode=0o700, exist_ok=True)
+    if not _trusted(path.parent):
+        raise PermissionError(path.parent)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp, path)
+    finally:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+
+
+def _stamp(path: Union[str, Path]) -> Optional[Tuple[int, int]]:
+    """Get the (mtime, size) of a file, or None if it does not exist."""
+    with suppress(OSError):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    return None
+
+
+def _flatten(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten nested tables into the environment variable names of their keys.
+
+    E.g: {"purifier": {"consul-host": "10.0.0.1"}} -> {"PURIFIER_CONSUL_HOST": "10.0.0.1"}
+    """
+    flat = {}
+    stack = [(data, "")]
+    while stack:
+        table, prefix = stack.pop()
+        for key, value in table.items():
+            name = prefix + str(key).upper().replace("-", "_")
+            if isinstance(value, dict):
+                stack.append((value, name + "_"))
+            else:
+                flat[name] = value
+    return flat
+
+
+def _parse_env(text: str) -> Dict[str, Any]:
+    """Parse the `NAME=value` lines of a .env file."""
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        if line.startswith("export "):
+            line = line.partition(" ")[2].lstrip()
+        name, value = line.split("=", 1)
+        value = value.strip()
+        if len(value) > 1 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        values[name.strip()] = value
+    return values
+
+
+def _parse_source(path: Path) -> Dict[str, Any]:
+    """Parse a config file by its extension, anything other than JSON or TOML is a .env file."""
+    text = path.read_text()
+    if path.suffix == ".json":
+        return _flatten(json.loads(text))
+    if path.suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+        return _flatten(tomllib.loads(text))
+    return _parse_env(text)
+
+
+def _read_source(path: Path, stamp: Tuple[int, int]) -> Dict[str, Any]:
+    """Read a source from the disk cache if it is current, parsing and caching it otherwise."""
+    import hashlib
+
+    cache = _cache_dir() / f"source-{hashlib.sha1(str(path).encode()).hexdigest()}.json"
+    with suppress(OSError, ValueError, KeyError, TypeError):
+        cached = json.loads(_read_cache(cache))
+        if cached["path"] == str(path) and cached["stamp"] == list(stamp):
+            return cached["values"]
+
+    values = _parse_source(path)
+    # Values that JSON cannot hold, such as TOML dates, are not cached on disk.
+    with suppress(OSError, TypeError, ValueError):
+        _write_cache(cache, json.dumps({"path": str(path), "stamp": stamp, "values": values}).encode())
+    return values
+
+
+def load_source(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Get the environment variable style values of a `.env`, JSON or TOML file.
+
+    Files are parsed once per change of their modification time or size, the
+    result being cached both in memory and on disk for other processes.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = str(path)
+    cached = _SOURCES.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = _SOURCES[key] = (stamp, _read_source(path, stamp))
+    return cached[1]
+
+
+def load_sources(paths: Iterable[Union[str, Path]]) -> FrozenJot:
+    """
+    Layer the values of each source file that exists, later files taking
+    precedence over earlier ones.
+    """
+    snapshot = Jot(auto=False)
+    for path in paths:
+        with suppress(FileNotFoundError):
+            snapshot.merge(load_source(path))
+    return FrozenJot(snapshot)
+
 
 def new_init(self: Union[argparse.ArgumentParser, argparse._ArgumentGroup], *args: Any, **kwargs: Any) -> None:
     """
@@ -26,6 +194,14 @@ def new_init(self: Union[argparse.ArgumentParser, argparse._ArgumentGroup], *arg
     if self.prefix:
         self.prefix += "_"
 
+    # Layered default sources are shared by a parser with its argument groups.
+    if "sources" in kwargs:
+        self.sources = kwargs.pop("sources")
+    elif isinstance(self, argparse._ArgumentGroup) and args:
+        self.sources = getattr(args[0], "sources", None)
+    else:
+        self.sources = None
+
     # Allow certain argument groups be muted unless a full `--help` is invoked.
     if "suppress_group" in kwargs:
         self.suppress_group = kwargs.pop("suppress_group")
@@ -35,6 +211,10 @@ def new_init(self: Union[argparse.ArgumentParser, argparse._ArgumentGroup], *arg
     # Route back to the original __init__ function.
     self._init(*args, **kwargs)
 
+    # Argument groups that are only built when they are used.
+    if isinstance(self, argparse.ArgumentParser):
+        self._lazy_groups = []
+
 
 def new_infer_name(self: argparse._ActionsContainer, name: str, use_prefix: bool = True) -> str:
     """
@@ -44,9 +224,12 @@ def new_infer_name(self: argparse._ActionsContainer, name: str, use_prefix: bool
     return "".join([self.prefix if use_prefix else "", name.lstrip("-").upper().replace("-", "_")])
 
 
-def override(name: str, **kwargs: Any) -> Any:
+def override(name: str, sources: Optional[FrozenJot] = None, **kwargs: Any) -> Any:
     """
     Take an environment variable and argument parameters to determine a default value.
+
+    The environment takes precedence over any layered sources, which take
+    precedence over the default value.
     """
     arg_action = kwargs.get("action", None)
     # Override the default value with that of the corresponding environment
@@ -71,6 +254,8 @@ def override(name: str, **kwargs: Any) -> Any:
 
     # Coerce the type before returning.
     if not kwargs.get("disable_envvar_override", False):
+        if sources:
+            arg_default = sources.get(name, arg_default)
         arg_default = os.environ.get(name, arg_default)
     if arg_default is not None:
         if not isinstance(arg_default, list):
@@ -78,11 +263,16 @@ def override(name: str, **kwargs: Any) -> Any:
     return arg_default
 
 
-def new_add_argument(self: argparse._ActionsContainer, *args: Any, **kwargs: Any) -> None:
+# The add_argument parameters that override resolves a default from.
+_OVERRIDE_KWARGS = ("action", "default", "type", "nargs", "disable_envvar_override")
+
+
+def new_add_argument(self: argparse._ActionsContainer, *args: Any, **kwargs: Any) -> argparse.Action:
     """
     Hook add_argument to change the default value to support an
     environment variable default.
     """
+    env_name = env_kwargs = None
     # Allow for certain arguments to not have the prefix added.
     use_prefix = True
     with suppress(KeyError):
@@ -95,14 +285,158 @@ def new_add_argument(self: argparse._ActionsContainer, *args: Any, **kwargs: Any
             # Don't override/provide a default value for a required or a const flag.
             if "const" in kwargs or "required" in kwargs:
                 break
-            kwargs["default"] = override(name, **kwargs)
+            env_name = name
+            env_kwargs = {key: kwargs[key] for key in _OVERRIDE_KWARGS if key in kwargs}
+            kwargs["default"] = override(name, getattr(self, "sources", None), **kwargs)
             break
 
     # Route back to the original add_argument.
-    self._add_argument(*args, **kwargs)
+    action = self._add_argument(*args, **kwargs)
+    # Remember which environment variable the default depends on, and how to
+    # resolve it again.
+    action.env_name = env_name
+    action.env_kwargs = env_kwargs
+    return action
+
+
+class LazyGroup:
+    """
+    Record the arguments of an argument group, adding them to the parser only
+    once one of its flags is passed, an environment variable or source sets
+    one of its flags, the help is printed or its default is asked for.
+    """
+
+    def __init__(self, parser: argparse.ArgumentParser, *args: Any, **kwargs: Any) -> None:
+        self.parser = parser
+        # The group is not added to the parser until it is built.
+        self.group = argparse._ArgumentGroup(parser, *args, **kwargs)
+        self.arguments: List[Tuple[Tuple[Any, ...], Dict[str, Any]]] = []
+        # The long flag, destination, environment variable name and keyword
+        # arguments of each argument that has a long flag.
+        self.names: List[Tuple[str, str, str, Dict[str, Any]]] = []
+        self.built = False
+
+    def add_argument(self, *args: Any, **kwargs: Any) -> None:
+        if self.built:
+            self.group.add_argument(*args, **kwargs)
+            return
+        self.arguments.append((args, kwargs))
+        flags = [arg for arg in args if arg.startswith("--")]
+        if flags:
+            dest = kwargs.get("dest", flags[0].lstrip("-").replace("-", "_"))
+            name = self.group._infer_name(flags[0], kwargs.get("use_prefix", True))
+            self.names.append((flags[0], dest, name, kwargs))
+
+    def wanted(self, argv: List[str]) -> bool:
+        """
+        Whether the group is set by the command line, the environment or a
+        source, or has arguments that must be given.
+        """
+        options = [arg.split("=", 1)[0] for arg in argv if arg.startswith("--") and len(arg) > 2]
+        sources = self.group.sources or {}
+        if len(self.names) < len(self.arguments):
+            # Positional and short-only arguments cannot be looked for.
+            return True
+        for flag, _, name, kwargs in self.names:
+            if name in os.environ or name in sources or kwargs.get("required"):
+                return True
+            # Long options may be abbreviated.
+            if any(flag.startswith(option) for option in options):
+                return True
+        return False
+
+    def has_dest(self, dest: str) -> bool:
+        return any(dest == name for _, name, _, _ in self.names)
+
+    def defaults(self) -> Iterator[Tuple[str, Any]]:
+        """Yield the destination and default of each argument, as they would be once built."""
+        for flag, dest, name, kwargs in self.names:
+            if flag.endswith("help") or flag.endswith("version"):
+                continue
+            if "const" in kwargs or "required" in kwargs:
+                default = kwargs.get("default")
+            else:
+                default = override(name, self.group.sources, **kwargs)
+            if default is not argparse.SUPPRESS:
+                yield dest, default
+
+    def build(self) -> argparse._ArgumentGroup:
+        if not self.built:
+            self.built = True
+            self.parser._action_groups.append(self.group)
+            for args, kwargs in self.arguments:
+                self.group.add_argument(*args, **kwargs)
+        return self.group
+
+
+def add_lazy_group(
+    parser: argparse.ArgumentParser, *args: Any, lazy: bool = True, **kwargs: Any
+) -> Union[LazyGroup, argparse._ArgumentGroup]:
+    """
+    Add an argument group to a parser that is only built when it is used. The
+    defaults of a group that was not built are filled in after parsing.
+
+    Groups are built immediately when not `lazy` or when added to anything
+    other than an argument parser.
+    """
+    if not lazy or not isinstance(parser, argparse.ArgumentParser):
+        return parser.add_argument_group(*args, **kwargs)
+    group = LazyGroup(parser, *args, **kwargs)
+    parser._lazy_groups.append(group)
+    return group
+
+
+def new_parse_known_args(
+    self: argparse.ArgumentParser, args: Optional[List[str]] = None, namespace: Optional[argparse.Namespace] = None
+) -> Tuple[argparse.Namespace, List[str]]:
+    """
+    Build the lazy groups that are used before parsing the arguments, and fill
+    in the defaults of the others afterwards.
+    """
+    lazy_groups = [group for group in self._lazy_groups if not group.built]
+    if not lazy_groups:
+        return self._parse_known(args, namespace)
+
+    args = sys.argv[1:] if args is None else list(args)
+    for group in lazy_groups:
+        if group.wanted(args):
+            group.build()
+    namespace, extras = self._parse_known(args, namespace)
+    for group in lazy_groups:
+        if not group.built:
+            for dest, default in group.defaults():
+                if not hasattr(namespace, dest):
+                    setattr(namespace, dest, default)
+    return namespace, extras
+
+
+def new_get_default(self: argparse.ArgumentParser, dest: str) -> Any:
+    # The default of an argument is only known once its group is built.
+    for group in self._lazy_groups:
+        if not group.built and group.has_dest(dest):
+            group.build()
+    return self._get_default(dest)
+
+
+def new_format_usage(self: argparse.ArgumentParser) -> str:
+    # The usage printed on errors shows every group.
+    for group in self._lazy_groups:
+        group.build()
+    return self._format_usage()
+
+
+def new_add_container_actions(self: argparse._ActionsContainer, container: argparse._ActionsContainer) -> None:
+    # Parents given to a parser only pass on the groups they have built.
+    for group in getattr(container, "_lazy_groups", ()):
+        group.build()
+    self._add_container(container)
 
 
 def new_format_help(self: argparse.ArgumentParser) -> str:
+    # Every group is shown in the help.
+    for group in self._lazy_groups:
+        group.build()
+
     # Save the original action groups before modifying their help output.
     action_groups = self._action_groups[:]
 
@@ -132,6 +466,18 @@ if not _MODIFIED:
     argparse.ArgumentParser._format_help = original_ap_format_help
     argparse.ArgumentParser.format_help = new_format_help
 
+    original_ap_format_usage = argparse.ArgumentParser.format_usage
+    argparse.ArgumentParser._format_usage = original_ap_format_usage
+    argparse.ArgumentParser.format_usage = new_format_usage
+
+    original_ap_parse_known_args = argparse.ArgumentParser.parse_known_args
+    argparse.ArgumentParser._parse_known = original_ap_parse_known_args
+    argparse.ArgumentParser.parse_known_args = new_parse_known_args
+
+    original_ap_get_default = argparse.ArgumentParser.get_default
+    argparse.ArgumentParser._get_default = original_ap_get_default
+    argparse.ArgumentParser.get_default = new_get_default
+
     original_ag_init = argparse._ArgumentGroup.__init__
     argparse._ArgumentGroup._init = original_ag_init
     argparse._ArgumentGroup.__init__ = new_init
@@ -142,6 +488,10 @@ if not _MODIFIED:
     argparse._ActionsContainer._add_argument = original_add
     argparse._ActionsContainer.add_argument = new_add_argument
 
+    original_add_container = argparse._ActionsContainer._add_container_actions
+    argparse._ActionsContainer._add_container = original_add_container
+    argparse._ActionsContainer._add_container_actions = new_add_container_actions
+
     # Add the new _infer_name function we need to the _ActionsContainer object.
     argparse._ActionsContainer._infer_name = new_infer_name
 
@@ -151,7 +501,12 @@ class CustomFormatter(argparse.ArgumentDefaultsHelpFormatter, argparse.RawDescri
 
 
 # Public API for argparse.ArgumentParser instances to use.
-def make_parser(name: str = "", description: Optional[str] = None, version: Optional[str] = None):
+def make_parser(
+    name: str = "",
+    description: Optional[str] = None,
+    version: Optional[str] = None,
+    sources: Optional[Iterable[Union[str, Path]]] = None,
+):
     """
     Pass in __file__ and all of the arguments will be settable with
     a prefix.
@@ -163,10 +518,163 @@ def make_parser(name: str = "", description: Optional[str] = None, version: Opti
     is equivalent to
 
     purifier --consul-host 10.0.0.1
+
+    Defaults can also be layered from files, which are overridden by the
+    environment and later files in the list.
+
+    E.g: make_parser("PURIFIER", sources=["purifier.toml", ".env"])
+
+    [purifier]
+    consul-host = "10.0.0.1"
     """
     parser = argparse.ArgumentParser(
-        description=description, formatter_class=CustomFormatter, prefix=os.path.splitext(name)[0].upper()
+        description=description,
+        formatter_class=CustomFormatter,
+        prefix=os.path.splitext(name)[0].upper(),
+        sources=load_sources(sources) if sources else None,
     )
+    parser.source_paths = [str(path) for path in sources or ()]
     if version:
         parser.add_argument("--version", action="version", version=version)
     return parser
+
+
+class Reloader:
+    """
+    Update parsed arguments when the environment or the source files of their
+    parser change, without restarting the process.
+
+    Sources are polled by their modification time and size. On a change, only
+    the changed files are parsed again and the default of every argument that
+    was not given on the command line is resolved again by the same rules as
+    `override`. Arguments whose value changed are updated in the Namespace
+    before the callbacks registered for them are called.
+
+    .. code-block:: python
+
+        reloader = Reloader(parser, cli_args)
+        logging_config.watch(reloader)
+        reloader.start(interval=5)
+    """
+
+    def __init__(
+        self, parser: argparse.ArgumentParser, cli_args: argparse.Namespace, args: Optional[List[str]] = None
+    ) -> None:
+        import threading
+
+        # Every argument is reloaded, including those of groups that were not needed.
+        for group in parser._lazy_groups:
+            group.build()
+        self.parser = parser
+        self.cli_args = cli_args
+        self.callbacks: List[Tuple[frozenset, Callable[[argparse.Namespace], Any]]] = []
+        self._args = sys.argv[1:] if args is None else list(args)
+        self._given = self._given_dests()
+        self._stamps = self._current()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _current(self) -> Tuple[Any, ...]:
+        """Get the current stamps of the sources and the values of the environment variables."""
+        sources = tuple(_stamp(path) for path in getattr(self.parser, "source_paths", ()))
+        names = [action.env_name for action in self.parser._actions if getattr(action, "env_name", None)]
+        return sources, tuple(os.environ.get(name) for name in names)
+
+    def _given_dests(self) -> Set[str]:
+        """
+        Find the arguments given on the command line, however they were spelled,
+        by parsing it again with every default suppressed.
+        """
+        saved = [(action, action.default) for action in self.parser._actions]
+        defaults = self.parser._defaults
+        try:
+            for action, _ in saved:
+                action.default = argparse.SUPPRESS
+            self.parser._defaults = {}
+            given, _ = self.parser.parse_known_args(self._args, argparse.Namespace())
+        finally:
+            for action, default in saved:
+                action.default = default
+            self.parser._defaults = defaults
+        return set(vars(given))
+
+    def on_change(self, dests: Iterable[str], callback: Callable[[argparse.Namespace], Any]) -> None:
+        """Call `callback` with the Namespace whenever any of the given arguments change."""
+        self.callbacks.append((frozenset(dests), callback))
+
+    def _resolve(self, sources: Optional[FrozenJot]) -> List[Tuple[argparse.Action, Any]]:
+        """
+        Resolve the default of every argument not given on the command line
+        again, raising ValueError for a value outside of its choices.
+        """
+        values = []
+        for action in self.parser._actions:
+            if getattr(action, "env_name", None) is None or action.dest in self._given:
+                continue
+            value = override(action.env_name, sources, **action.env_kwargs)
+            if action.choices is not None and value is not None:
+                for item in value if isinstance(value, list) else [value]:
+                    if item not in action.choices:
+                        raise ValueError(f"invalid choice for {action.env_name}: {item!r}")
+            values.append((action, value))
+        return values
+
+    def poll(self) -> List[str]:
+        """
+        Check for changes once, returning the arguments that were updated.
+
+        Nothing is updated when a value cannot be resolved, and the change is
+        tried again on the next poll. Callbacks that raise are logged.
+        """
+        import logging
+
+        stamps = self._current()
+        if stamps == self._stamps:
+            return []
+        sources = load_sources(self.parser.source_paths) if getattr(self.parser, "source_paths", None) else None
+        values = self._resolve(sources)
+        self._stamps = stamps
+
+        # Lazy groups that are built later resolve their defaults from the new sources.
+        self.parser.sources = sources
+        for group in self.parser._action_groups + [lazy.group for lazy in self.parser._lazy_groups]:
+            group.sources = sources
+
+        changed = []
+        for action, value in values:
+            action.default = value
+            if value != getattr(self.cli_args, action.dest, None):
+                setattr(self.cli_args, action.dest, value)
+                changed.append(action.dest)
+
+        for dests, callback in self.callbacks:
+            if dests.intersection(changed):
+                try:
+                    callback(self.cli_args)
+                except Exception:
+                    logging.getLogger(__name__).exception("reload callback failed")
+        return changed
+
+    def _run(self, interval: float) -> None:
+        import logging
+
+        while not self._stop.wait(interval):
+            try:
+                self.poll()
+            except Exception:
+                logging.getLogger(__name__).exception("could not reload the arguments")
+
+    def start(self, interval: float = 5.0) -> None:
+        """Poll for changes every `interval` seconds from a daemon thread."""
+        import threading
+
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="reloader", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
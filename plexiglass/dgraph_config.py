@@ -6,10 +6,16 @@ https://dgraph.io/
 import argparse
 from typing import Any
 
+from plexiglass.argparse_config import add_lazy_group
+
 
 def configure_parser(parser: argparse.ArgumentParser, **kwargs: Any) -> None:
-    dgraph_group = parser.add_argument_group(
-        "Dgraph", "flags to control Dgraph integration", suppress_group=kwargs.get("suppress_group", True)
+    dgraph_group = add_lazy_group(
+        parser,
+        "Dgraph",
+        "flags to control Dgraph integration",
+        lazy=kwargs.get("lazy", True),
+        suppress_group=kwargs.get("suppress_group", True),
     )
     dgraph_group.add_argument("--dgraph-host", default="127.0.0.1", help="Address of a Dgraph Alpha server")
     dgraph_group.add_argument(
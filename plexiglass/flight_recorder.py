@@ -0,0 +1,157 @@
+"""
+Keep the most recent log events in memory, including events below the level
+that is written out, and dump them to the debug workspace when something goes
+wrong.
+
+.. code-block:: python
+
+    import logging
+
+    from plexiglass import flight_recorder
+
+    recorder = flight_recorder.start(cli_args, level=logging.DEBUG, size=1000)
+    # Run as the first structlog processor, before filter_by_level.
+    structlog.configure(processors=[recorder, structlog.stdlib.filter_by_level, ...])
+
+The events are dumped as JSON lines to `workspace_dirs.debug` whenever
+`workspace.set_error_flag` is called or an exception goes unhandled.
+"""
+import argparse
+from collections import deque
+import datetime
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from plexiglass import workspace
+
+
+# The levels of the structlog methods.
+_METHOD_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+    "exception": logging.ERROR,
+    "critical": logging.CRITICAL,
+    "fatal": logging.CRITICAL,
+}
+
+_RECORDER: Optional["FlightRecorder"] = None
+_HOOKED = False
+# Numbers the dumps of this process, so that dumps never overwrite each other.
+_DUMP_COUNTER = itertools.count()
+
+Event = Tuple[float, Optional[str], str, Dict[str, Any]]
+
+
+class FlightRecorder:
+    """
+    A structlog processor that keeps the last `size` events at or above `level`
+    in a ring buffer, leaving them unrendered until they are dumped.
+    """
+
+    def __init__(self, cli_args: Optional[argparse.Namespace] = None, level: int = logging.DEBUG, size: int = 1000):
+        self.cli_args = cli_args
+        self.level = level
+        self.events: Deque[Event] = deque(maxlen=size)
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        if _METHOD_LEVELS.get(method_name, logging.CRITICAL) >= self.level:
+            event = dict(event_dict)
+            if event.get("exc_info"):
+                # Tracebacks are formatted now rather than keeping their frames alive.
+                event["exc_info"] = _format_exc_info(event["exc_info"])
+            self.events.append((time.time(), getattr(logger, "name", None), method_name, event))
+        return event_dict
+
+    def render(self) -> bytes:
+        """Render the recorded events as JSON lines, oldest first."""
+        lines = []
+        for timestamp, name, method_name, event in list(self.events):
+            line = {
+                "timestamp": datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat(),
+                "logger": name,
+                "level": logging.getLevelName(_METHOD_LEVELS.get(method_name, logging.NOTSET)).lower(),
+                **event,
+            }
+            lines.append(json.dumps(line, default=repr))
+        return "".join(f"{line}\n" for line in lines).encode()
+
+    def dump(self, cli_args: Optional[argparse.Namespace] = None) -> None:
+        """Write the recorded events to the debug workspace, if there is one."""
+        cli_args = cli_args or self.cli_args
+        if cli_args is None or not self.events or "debug" not in getattr(cli_args, "workspace_dirs", {}):
+            return
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S.%f")
+        name = f"flight-recorder-{stamp}-{os.getpid()}-{next(_DUMP_COUNTER)}.jsonl"
+        with workspace.createfile(cli_args, "debug", name) as dump_file:
+            dump_file.write(self.render())
+
+
+def _format_exc_info(exc_info: Any) -> str:
+    if not isinstance(exc_info, (tuple, BaseException)):
+        exc_info = sys.exc_info()
+    if isinstance(exc_info, BaseException):
+        exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+    return "".join(traceback.format_exception(*exc_info))
+
+
+def dump(cli_args: Optional[argparse.Namespace] = None) -> None:
+    """Dump the events of the running recorder, never raising."""
+    recorder = _RECORDER
+    if recorder is not None:
+        try:
+            recorder.dump(cli_args)
+        except Exception:  # pragma: no cover
+            logging.getLogger(__name__).exception("could not dump the flight recorder")
+
+
+def _excepthook(*args: Any) -> None:
+    dump()
+    hook = _ORIGINAL_HOOKS[0]
+    if hook is not None:
+        hook(*args)
+
+
+def _thread_excepthook(args: Any) -> None:
+    dump()
+    hook = _ORIGINAL_HOOKS[1]
+    if hook is not None:
+        hook(args)
+
+
+# threading.excepthook was added in Python 3.8.
+_ORIGINAL_HOOKS: List[Optional[Callable[..., Any]]] = [sys.excepthook, getattr(threading, "excepthook", None)]
+
+
+def start(
+    cli_args: Optional[argparse.Namespace] = None, level: int = logging.DEBUG, size: int = 1000
+) -> FlightRecorder:
+    """
+    Start recording events, dumping them when the workspace error flag is set
+    or an exception goes unhandled.
+    """
+    global _RECORDER, _HOOKED
+    _RECORDER = FlightRecorder(cli_args, level, size)
+    if not _HOOKED:
+        _HOOKED = True
+        _ORIGINAL_HOOKS[:] = [sys.excepthook, getattr(threading, "excepthook", None)]
+        sys.excepthook = _excepthook
+        if _ORIGINAL_HOOKS[1] is not None:
+            threading.excepthook = _thread_excepthook
+        workspace.on_error_flag(dump)
+    return _RECORDER
+
+
+def stop() -> None:
+    """Stop recording events and drop those that were recorded."""
+    global _RECORDER
+    _RECORDER = None
@@ -1,22 +1,123 @@
+from collections import deque
+from contextlib import suppress
+import copy
+from functools import lru_cache
+import io
 import json
+from typing import Any, Dict, Optional
 
 
-def resolve(obj):
+_MISSING = object()
+# orjson is imported on first use, since importing it slows down the startup
+# of tools that never serialize a Jot.
+_orjson = _MISSING
+# Values that resolve to themselves, copied into lists without a call to resolve.
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def resolve(obj: Any) -> Any:
     """
     Make a clean non-referential copy of the original object.
     """
     if isinstance(obj, dict):
-        return {k: v for k, v in obj.items()}
-    elif type(obj).__name__ == "Jot":
+        return dict(obj)
+    elif isinstance(obj, Jot):
         return obj()
     elif isinstance(obj, list):
-        return [resolve(x) for x in obj]
+        return _resolve_list(obj)
     else:
         return obj
 
 
+def _resolve_list(obj):
+    """
+    Copy a list and any lists nested within it using an explicit stack so that
+    deeply nested lists cannot exhaust the recursion limit.
+    """
+    result = []
+    stack = [(obj, result)]
+    while stack:
+        items, copy = stack.pop()
+        for item in items:
+            if type(item) in _SCALARS:
+                copy.append(item)
+            elif isinstance(item, list):
+                nested = []
+                copy.append(nested)
+                stack.append((item, nested))
+            else:
+                copy.append(resolve(item))
+    return result
+
+
+def _replace_list(current, value):
+    """Replace the list with a copy of the new one."""
+    return _resolve_list(value)
+
+
+def _reference_list(current, value):
+    """Replace the list with the new one itself, without copying it."""
+    return value
+
+
+def _append_list(current, value):
+    """Append a copy of the new items to the current list."""
+    if not isinstance(current, list):
+        return _resolve_list(value)
+    current.extend(_resolve_list(value))
+    return current
+
+
+def _union_list(current, value):
+    """Append the new items that are not already in the current list."""
+    result = current if isinstance(current, list) else []
+    seen = set()
+    unhashable = []
+    for item in result:
+        try:
+            seen.add(item)
+        except TypeError:
+            unhashable.append(item)
+    for item in _resolve_list(value):
+        try:
+            if item in seen:
+                continue
+            seen.add(item)
+        except TypeError:
+            if item in unhashable:
+                continue
+            unhashable.append(item)
+        result.append(item)
+    return result
+
+
+LIST_STRATEGIES = {
+    "replace": _replace_list,
+    "reference": _reference_list,
+    "append": _append_list,
+    "union": _union_list,
+}
+
+
+def _list_strategy(strategy):
+    return strategy if callable(strategy) else LIST_STRATEGIES[strategy]
+
+
+def _merge_frame(source, destination, lazy=False, path=None):
+    """Get the pending items and the fields to write for one level of a merge."""
+    # Raw dictionaries in the view of an automatic Jot stand in for Jots that
+    # have not been loaded yet.
+    if isinstance(source, Jot):
+        lazy = source._auto_
+        source = source._view_()
+    # Nested destinations are Jots, write directly into their fields.
+    wrap = isinstance(destination, Jot)
+    fields = destination._fields_() if wrap else destination
+    return iter(source.items()), fields, wrap, lazy, path
+
+
 # https://stackoverflow.com/questions/20656135/python-deep-merge-dictionary-data
-def merge(source, destination, auto=True):
+def merge(source, destination, auto=True, lists="replace"):
     """
     run me with nosetests --with-doctest file.py
 
@@ -24,29 +125,72 @@ def merge(source, destination, auto=True):
     >>> b = { 'first' : { 'all_rows' : { 'fail' : 'cat', 'number' : '5' } } }
     >>> merge(b, a) == { 'first' : { 'all_rows' : { 'pass' : 'dog', 'fail' : 'cat', 'number' : '5' } } }
     True
+
+    Nested nodes are merged from an explicit stack rather than by recursing,
+    so arbitrarily deep documents can be merged.
+
+    `lists` picks how lists are merged, either everywhere or per dotted path
+    with a dict such as `{"samples.hashes": "union"}`, falling back to
+    "replace" for lists at any other path:
+
+    - "replace" (default) replaces the list with a deep copy of the new one.
+    - "reference" replaces the list with the new one without copying it, so
+      later changes to either list are seen by both.
+    - "append" extends the current list with a copy of the new items.
+    - "union" extends the current list with the new items it does not have.
+
+    A strategy can also be any callable taking the current value (None when
+    missing) and the new list, and returning the list to store.
+
+    >>> merge({'tags': ['b', 'c']}, {'tags': ['a', 'b']}, lists='union')
+    {'tags': ['a', 'b', 'c']}
     """
-    for key, value in source.items():
-        if auto and isinstance(value, dict):
-            # get node or create one
-            # all nested dictionaries are turned into Jots.
-            node = destination.setdefault(key, eval("Jot()"))
-            merge(resolve(value), node, auto=auto)
-        elif type(value).__name__ == "Jot":
-            # get node or create one
-            node = destination.setdefault(key, type(value)())
-            merge(resolve(value), node, auto=auto)
-        elif isinstance(value, list):
-            # copy the list, making sure to resolve any nested Jots
-            destination[key] = resolve(value)
+    paths = None
+    if isinstance(lists, dict):
+        paths = {tuple(path.split(".")): _list_strategy(strategy) for path, strategy in lists.items()}
+        default = _replace_list
+    else:
+        default = _list_strategy(lists)
+
+    stack = [_merge_frame(source, destination, path=() if paths else None)]
+    while stack:
+        items, fields, wrap, lazy, path = stack[-1]
+        for key, value in items:
+            if (auto and isinstance(value, dict)) or (lazy and type(value) is dict):
+                # get node or create one
+                # all nested dictionaries are turned into Jots.
+                node = fields.get(key, _MISSING)
+                if node is _MISSING:
+                    node = fields[key] = Jot()
+            elif isinstance(value, Jot):
+                # get node or create one
+                node = fields.get(key, _MISSING)
+                if node is _MISSING:
+                    node = fields[key] = _new_node(value)
+            elif isinstance(value, list):
+                strategy = paths.get(path + (key,), default) if paths else default
+                fields[key] = strategy(fields[key] if key in fields else None, value)
+                continue
+            else:
+                # copy the value, making sure to resolve any nested Jots
+                value = resolve(value)
+                # Assigning into a Jot wraps plain dicts, as Jot.__setitem__ does.
+                if wrap and type(value) is dict:
+                    value = Jot(value)
+                fields[key] = value
+                continue
+            # Descend into the node before carrying on with this level.
+            stack.append(_merge_frame(value, node, lazy, path + (key,) if paths else None))
+            break
         else:
-            destination[key] = resolve(value)
+            stack.pop()
 
     return destination
 
 
 def unpack(o):
     if isinstance(o, Jot):
-        return {k: unpack(v) for k, v in o.__dict__.items()}
+        return {k: unpack(v) for k, v in o._view_().items()}
     elif isinstance(o, dict):
         return {k: unpack(v) for k, v in o.items()}
     # XXX: Support arbitrary iterables? Out of scope for now with simple json.
@@ -55,32 +199,371 @@ def unpack(o):
     return o
 
 
+def _encode(o):
+    """
+    Hand a Jot's own mapping (or that of anything else with a `_view_`, such as
+    a record) to the JSON encoder in place of the object, so that nothing needs
+    to be copied before it is serialized.
+    """
+    view = getattr(type(o), "_view_", None)
+    if view is not None:
+        return view(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def iterencode(jot):
+    """
+    Yield compact JSON for a Jot in chunks as it is encoded.
+    """
+    encoder = json.JSONEncoder(default=_encode, ensure_ascii=False, separators=(",", ":"))
+    return encoder.iterencode(jot)
+
+
+def _fast_json() -> Any:
+    """Get the orjson module, or None when it is not installed."""
+    global _orjson
+    if _orjson is _MISSING:
+        _orjson = None
+        with suppress(ImportError):
+            import orjson as _orjson
+    return _orjson
+
+
+def dumps(jot):
+    """
+    Encode a Jot as compact JSON, using orjson when it is installed.
+
+    orjson writes `NaN` and `Infinity` as `null`, where the standard library
+    (and `repr`) write them as is.
+    """
+    orjson = _fast_json()
+    if orjson is not None:
+        # Anything orjson cannot handle (e.g. very deep nesting or huge ints)
+        # falls back to the standard library.
+        with suppress(orjson.JSONEncodeError):
+            return orjson.dumps(jot, default=_encode, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(jot, default=_encode, ensure_ascii=False, separators=(",", ":"))
+
+
+def dump(jot, fp):
+    """
+    Write a Jot to a text or binary file-like object as compact JSON.
+
+    Binary files are written in one call by orjson when it is installed,
+    otherwise the JSON is streamed to the file in chunks as it is encoded.
+    """
+    binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(fp, "mode", "")
+    orjson = _fast_json()
+    if binary and orjson is not None:
+        with suppress(orjson.JSONEncodeError):
+            fp.write(orjson.dumps(jot, default=_encode, option=orjson.OPT_NON_STR_KEYS))
+            return
+    for chunk in iterencode(jot):
+        fp.write(chunk.encode() if binary else chunk)
+
+
+def _parse(data):
+    """
+    Parse a JSON document, using orjson when it is installed.
+
+    Unlike `json.loads`, orjson reads integers beyond 64 bits as floats and
+    rejects `NaN` and `Infinity`, so only the `load` functions use it.
+    """
+    orjson = _fast_json()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def loads(data, auto=True):
+    """
+    Lazily load a Jot from a JSON object.
+
+    The document is parsed up front, but nested Jots are only built from the
+    parsed dictionaries as their keys are first accessed. When orjson is
+    installed it parses the document, so integers beyond 64 bits load as
+    floats and `NaN` or `Infinity` are rejected, use `Jot(data)` to parse
+    them as `json.loads` does.
+    """
+    document = _parse(data)
+    if not isinstance(document, dict):
+        raise ValueError("Jots can only be loaded from JSON objects")
+    result = Jot(auto=auto)
+    result._base_ = document
+    return result
+
+
+def load(fp, auto=True):
+    """
+    Lazily load a Jot from a file-like object containing a JSON object.
+    """
+    return loads(fp.read(), auto=auto)
+
+
+def load_lines(fp, auto=True):
+    """
+    Lazily load a Jot from each line of a JSONL file-like object as it is read.
+    """
+    for line in fp:
+        if line.strip():
+            yield loads(line, auto=auto)
+
+
+def _share(value, auto=True):
+    """
+    Wrap a value pulled down from a shared base.
+
+    Nested Jots, and with `auto` set nested dictionaries, become new Jots that
+    read through to the original node so that their own subtrees remain shared
+    until touched, everything else is copied as it would be by `merge`.
+    """
+    if isinstance(value, Jot):
+        node = _new_node(value)
+    elif auto and isinstance(value, dict):
+        node = Jot()
+    else:
+        return resolve(value)
+    node._base_ = value
+    return node
+
+
+@lru_cache(maxsize=4096)
+def _compile_path(path):
+    """
+    Split a dotted path (or a tuple of keys) into the steps to take through a
+    Jot, once per distinct path.
+
+    Each step is a key along with its integer form for indexing into lists.
+    """
+    keys = path.split(".") if isinstance(path, str) else path
+    steps = []
+    for key in keys:
+        index = None
+        if isinstance(key, int):
+            index = key
+        elif key.lstrip("-").isdigit():
+            index = int(key)
+        steps.append((key, index))
+    return tuple(steps)
+
+
+def _step(node, key, index):
+    """Take one step along a path without creating anything."""
+    if isinstance(node, Jot):
+        # Only pull from a base for keys missing from the Jot itself.
+        return node.__dict__[key] if key in node.__dict__ else node._pull_(key)
+    elif isinstance(node, (list, tuple)) and index is not None:
+        return node[index]
+    elif isinstance(node, dict):
+        return node[key]
+    raise KeyError(key)
+
+
+def _unpickle(cls, auto, prefix):
+    """Create an empty Jot to load pickled fields into."""
+    return cls(auto=auto, prefix=prefix)
+
+
+def _unpickle_frozen(fields):
+    """Rebuild a FrozenJot, computing its hash again in this process."""
+    return FrozenJot._from_items_(fields.items())
+
+
+def _new_node(value):
+    """Create an empty node to copy a Jot into, thawing FrozenJots."""
+    return Jot() if isinstance(value, FrozenJot) else type(value)()
+
+
+def _view(base):
+    """Get the mapping behind the base of a Jot."""
+    return base._view_() if isinstance(base, Jot) else base
+
+
+def _origin(value):
+    """Follow untouched copy-on-write views back to the node they share."""
+    while isinstance(value, Jot) and value._base_ is not None and not value.__dict__:
+        value = value._base_
+    return value
+
+
+def _mapping(value):
+    """Get the mapping to compare for a Jot or dict, or None for anything else."""
+    if isinstance(value, Jot):
+        return value._view_()
+    elif isinstance(value, dict):
+        return value
+    return None
+
+
+def diff(old, new):
+    """
+    Compare two Jots and get the changes that turn `old` into `new`.
+
+    The result is a Jot holding lists of `added` and `changed` [path, value]
+    pairs and of `removed` paths, where each path is a list of keys. Nested
+    Jots and dicts are compared key by key, any other values that differ are
+    replaced as a whole. Subtrees shared between the two, as with copy-on-write
+    Jots, are skipped without being walked. Values are not copied, so the
+    changes should be applied or serialized before `new` is modified.
+    """
+    added, removed, changed = [], [], []
+    pending = deque([([], old, new)])
+    while pending:
+        path, old_node, new_node = pending.popleft()
+        old_fields, new_fields = _mapping(old_node), _mapping(new_node)
+        for key, value in new_fields.items():
+            if key not in old_fields:
+                added.append([path + [key], value])
+                continue
+            previous = old_fields[key]
+            if _origin(previous) is _origin(value):
+                continue
+            if _mapping(previous) is not None and _mapping(value) is not None:
+                pending.append((path + [key], previous, value))
+            elif type(previous) is not type(value) or previous != value:
+                changed.append([path + [key], value])
+        removed.extend(path + [key] for key in old_fields if key not in new_fields)
+
+    changes = Jot(auto=False)
+    changes.__dict__.update(added=added, removed=removed, changed=changed)
+    return changes
+
+
+def _patch_parent(jot, path):
+    """Step to the node holding the last key of a path, pulling it if shared."""
+    node = jot
+    for key in path[:-1]:
+        node = _step(node, key, None)
+    return node
+
+
+def patch(jot, changes):
+    """
+    Apply changes from `diff` to a Jot in place, only touching the nodes along
+    the changed paths, and return it.
+    """
+    fields = _mapping(changes)
+    for path in fields.get("removed", ()):
+        node = _patch_parent(jot, path)
+        (node._fields_() if isinstance(node, Jot) else node).pop(path[-1], None)
+    for path, value in [*fields.get("changed", ()), *fields.get("added", ())]:
+        _patch_parent(jot, path)[path[-1]] = resolve(value)
+    return jot
+
+
 class Jot:
-    __slots__ = ["_prefix_", "_auto_", "__dict__"]
+    __slots__ = ["_prefix_", "_auto_", "_base_", "__dict__"]
 
-    def __init__(self, data=None, auto=True, prefix=None):
+    def __init__(self, data: Any = None, auto: bool = True, prefix: Optional[str] = None) -> None:
         self.__dict__ = dict()
         self._auto_ = auto
         self._prefix_ = prefix or ""
+        # A copy-on-write or lazily loaded Jot reads through to its base (a Jot
+        # or a plain dictionary) for any key it has not yet pulled into its own
+        # __dict__.
+        self._base_ = None
         if prefix and data:
             raise ValueError("Jots must be assigned a prefix before loading data")
         if data:
             self.merge(data)
 
-    def merge(self, other):
+    def merge(self, other: Any, lists: Any = "replace") -> None:
+        """
+        Merge a dict, Jot or JSON string into this Jot, see `jot.merge` for the
+        `lists` strategies.
+        """
         if isinstance(other, str):
-            merge(json.loads(other), self.__dict__, auto=self._auto_)
+            merge(json.loads(other), self._fields_(), auto=self._auto_, lists=lists)
         if isinstance(other, dict):
-            merge(other, self.__dict__, auto=self._auto_)
+            merge(other, self._fields_(), auto=self._auto_, lists=lists)
         elif isinstance(other, Jot):
-            merge(other.__dict__, self.__dict__, auto=self._auto_)
+            merge(other, self._fields_(), auto=self._auto_, lists=lists)
+
+    def _lookup_(self, key):
+        """Find the current value for a key without pulling it from the base."""
+        try:
+            return self.__dict__[key]
+        except KeyError:
+            base = self._base_
+            if base is None:
+                raise
+        return base._lookup_(key) if isinstance(base, Jot) else base[key]
+
+    def _pull_(self, key):
+        """Copy a single key down from the base, leaving its subtree shared."""
+        result = _share(self._lookup_(key), self._auto_)
+        self.__dict__[key] = result
+        return result
+
+    def _view_(self) -> Dict[str, Any]:
+        """
+        Get a read-only mapping of every key without pulling from the base.
+
+        Nested values read from a dictionary base are left as raw dictionaries.
+        """
+        if self._base_ is None:
+            return self.__dict__
+        view = dict(_view(self._base_))
+        view.update(self.__dict__)
+        return view
+
+    def _fields_(self):
+        """
+        Pull every remaining key down from the base and detach from it.
+
+        Nested Jots are still shared lazily, so this only costs the width of
+        this one node.
+        """
+        if self._base_ is not None:
+            own = self.__dict__
+            # Overlaid keys keep their position from the base, new keys follow.
+            fields = {k: own[k] if k in own else _share(v, self._auto_) for k, v in _view(self._base_).items()}
+            fields.update(own)
+            self.__dict__ = fields
+            self._base_ = None
+        return self.__dict__
+
+    def get_path(self, path, default=None):
+        """
+        Get the value at a dotted path such as "a.b.0.c", or `default` if any
+        step along it is missing.
+
+        Paths are compiled once and cached, and missing nodes are never created
+        regardless of `auto`. A tuple of keys may be given for keys that
+        contain dots.
+        """
+        node = self
+        try:
+            for key, index in _compile_path(path):
+                # Inline the common steps through a Jot.
+                if isinstance(node, Jot):
+                    fields = node.__dict__
+                    if key in fields:
+                        node = fields[key]
+                    elif node._base_ is not None:
+                        node = node._pull_(key)
+                    else:
+                        return default
+                else:
+                    node = _step(node, key, index)
+        except (KeyError, IndexError):
+            return default
+        return node
+
+    def get_paths(self, paths, default=None):
+        """
+        Get the values at several paths at once as a list, using `default` for
+        any that are missing.
+        """
+        get_path = self.get_path
+        return [get_path(path, default) for path in paths]
 
     def __bool__(self):
-        return bool(self.__dict__)
+        return bool(self.__dict__) or (self._base_ is not None and bool(self._base_))
 
     def __contains__(self, key):
         """Necessary as proxying __contains__ to the underlying __dict__ recurses infinitely."""
-        return key in self.__dict__
+        return key in self.__dict__ or (self._base_ is not None and key in self._base_)
 
     def __getattr__(self, name, *args, **kwargs):
         # Attempt to get the raw attribute on the Jot object.
@@ -89,13 +572,21 @@ class Jot:
         except AttributeError:
             pass
 
+        # Attempt to pull the attribute down from a shared base.
+        if self._base_ is not None:
+            with suppress(KeyError):
+                return self._pull_(name)
+
         # Attempt to get the raw attribute on the Jot's dictionary.
         try:
-            return self.__dict__.__getattribute__(name)
+            self.__dict__.__getattribute__(name)
         except AttributeError:
             # If _auto_ is not set, do not dynamically create a new attribute.
             if not self._auto_:
                 raise
+        else:
+            # Dict methods see every key, so detach from any shared base first.
+            return self._fields_().__getattribute__(name)
 
         # Force creation of a new attribute if it does not exist.
         result = Jot()
@@ -110,10 +601,17 @@ class Jot:
                 value = Jot(value)
         super().__setattr__(name, value)
 
+    def __delattr__(self, name):
+        self._fields_()
+        super().__delattr__(name)
+
     def __getitem__(self, key):
         try:
             return self.__dict__[key]
         except KeyError:
+            if self._base_ is not None:
+                with suppress(KeyError):
+                    return self._pull_(key)
             # If _auto_ is not set, do not dynamically add new keys.
             if not self._auto_:
                 raise
@@ -129,10 +627,197 @@ class Jot:
         self.__dict__[key] = value
 
     def __repr__(self):
-        return json.dumps(unpack(self))
+        return json.dumps(self, default=_encode)
+
+    def __reduce__(self):
+        """
+        Pickle a Jot as its settings plus its fields.
+
+        Defining this (and __setstate__) keeps pickle and copy from probing the
+        Jot for optional hooks, which would otherwise create them as keys.
+        """
+        return _unpickle, (type(self), self._auto_, self._prefix_), self._fields_()
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+
+    def __copy__(self):
+        new_jot = _unpickle(type(self), self._auto_, self._prefix_)
+        new_jot.__dict__ = dict(self._fields_())
+        return new_jot
+
+    def __deepcopy__(self, memo):
+        new_jot = _unpickle(type(self), self._auto_, self._prefix_)
+        memo[id(self)] = new_jot
+        new_jot.__dict__ = copy.deepcopy(self._fields_(), memo)
+        return new_jot
 
-    def __call__(self, other={}):
+    def __call__(self, other={}, cow=False):
+        """
+        Derive a new Jot from this one with `other` merged on top.
+
+        With `cow` set, the new Jot shares every subtree of this one that the
+        overlay does not touch and only copies nodes as they are read or
+        written, so the cost tracks the size of the overlay rather than the
+        size of this Jot. The base should not be mutated while copy-on-write
+        Jots derived from it are still in use.
+        """
         new_jot = Jot(auto=self._auto_)
-        new_jot.merge(self)
-        new_jot.merge(other)
+        if cow:
+            new_jot._base_ = self
+        else:
+            new_jot.merge(self)
+        if other:
+            new_jot.merge(other)
+        return new_jot
+
+
+_MUTATORS = frozenset(["clear", "pop", "popitem", "setdefault", "update"])
+_THAWED = (Jot, dict, list, tuple, set)
+
+
+def _freeze_items(value):
+    """Get the items of a container for freezing."""
+    if isinstance(value, Jot):
+        return iter(value._view_().items())
+    elif isinstance(value, dict):
+        return iter(value.items())
+    return iter(value)
+
+
+def _freeze_build(container, items):
+    """Build the frozen counterpart of a container from its frozen items."""
+    if isinstance(container, (Jot, dict)):
+        return FrozenJot._from_items_(items)
+    elif isinstance(container, set):
+        return frozenset(items)
+    return tuple(items)
+
+
+def _frozen(value):
+    """
+    Get the value as is if it is already immutable, including Jots that are
+    untouched copy-on-write views of a FrozenJot.
+    """
+    while isinstance(value, Jot) and value._base_ is not None and not value.__dict__:
+        value = value._base_
+    if isinstance(value, FrozenJot) or not isinstance(value, _THAWED):
+        return value
+    return _MISSING
+
+
+def _freeze(value):
+    """
+    Make an immutable copy of a value, turning Jots and dicts into FrozenJots,
+    lists and tuples into tuples and sets into frozensets.
+
+    Existing FrozenJots are reused rather than copied and nested values are
+    visited from an explicit stack rather than by recursing.
+    """
+    result = _frozen(value)
+    if result is not _MISSING:
+        return result
+    # Each frame holds a container, its remaining items, its frozen items and
+    # the key it is stored under in its parent.
+    stack = [(value, _freeze_items(value), [], None)]
+    while True:
+        container, items, frozen, parent_key = stack[-1]
+        mapping = isinstance(container, (Jot, dict))
+        for item in items:
+            key, child = item if mapping else (None, item)
+            result = _frozen(child)
+            if result is _MISSING:
+                stack.append((child, _freeze_items(child), [], key))
+                break
+            frozen.append((key, result) if mapping else result)
+        else:
+            stack.pop()
+            result = _freeze_build(container, frozen)
+            if not stack:
+                return result
+            parent, _, parent_frozen, _ = stack[-1]
+            parent_frozen.append((parent_key, result) if isinstance(parent, (Jot, dict)) else result)
+
+
+class FrozenJot(Jot):
+    """
+    An immutable, hashable copy of a Jot.
+
+    Nested Jots and dicts are frozen as well, lists and tuples become tuples
+    and sets become frozensets. Missing keys raise instead of being created, so
+    reading a FrozenJot never changes it and it can be shared between threads
+    without locking. The hash is computed once up front, so every value must be
+    hashable.
+    """
+
+    __slots__ = ["_hash_"]
+
+    def __init__(self, data: Any = None) -> None:
+        if isinstance(data, str):
+            data = json.loads(data)
+        frozen = _freeze(data if data is not None else {})
+        if not isinstance(frozen, FrozenJot):
+            raise ValueError("FrozenJots can only be built from Jots, dicts or JSON objects")
+        FrozenJot._init_(self, frozen.__dict__, frozen._hash_)
+
+    @staticmethod
+    def _init_(node, fields, hash_value):
+        object.__setattr__(node, "__dict__", fields)
+        object.__setattr__(node, "_auto_", False)
+        object.__setattr__(node, "_prefix_", "")
+        object.__setattr__(node, "_base_", None)
+        object.__setattr__(node, "_hash_", hash_value)
+
+    @classmethod
+    def _from_items_(cls, items):
+        node = cls.__new__(cls)
+        fields = dict(items)
+        FrozenJot._init_(node, fields, hash(frozenset(fields.items())))
+        return node
+
+    def _immutable_(self, *args, **kwargs):
+        raise TypeError("FrozenJot objects are immutable")
+
+    merge = __setattr__ = __delattr__ = __setitem__ = _immutable_
+
+    def __getattr__(self, name, *args, **kwargs):
+        if name in _MUTATORS:
+            self._immutable_()
+        # Only the read-only dict methods are left, never create attributes.
+        return self.__dict__.__getattribute__(name)
+
+    def __getitem__(self, key):
+        return self.__dict__[key]
+
+    def __hash__(self):
+        return self._hash_
+
+    def __reduce__(self):
+        return _unpickle_frozen, (self.__dict__,)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenJot):
+            return NotImplemented
+        return self._hash_ == other._hash_ and self.__dict__ == other.__dict__
+
+    def __call__(self, other={}, cow=False):
+        """
+        Derive a new mutable Jot from this one with `other` merged on top.
+
+        As a FrozenJot never changes, it is always safe to derive from it with
+        `cow` set.
+        """
+        new_jot = Jot()
+        if cow:
+            new_jot._base_ = self
+        else:
+            new_jot.merge(self)
+        if other:
+            new_jot.merge(other)
         return new_jot
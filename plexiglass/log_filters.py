@@ -0,0 +1,146 @@
+"""
+structlog processors that keep a flood of repeated log events from swamping
+the log pipeline.
+
+.. code-block:: python
+
+    import structlog
+
+    from plexiglass import log_filters
+
+    structlog.configure(
+        processors=[
+            structlog.stdlib.add_log_level,
+            log_filters.Sampler({"debug": 0.01}),
+            log_filters.RateLimiter(rate=10, burst=20),
+            log_filters.Deduplicator(window=5),
+            structlog.processors.JSONRenderer(),
+        ]
+    )
+
+Each processor expects the `level` key added by `add_log_level`. Events that
+were dropped by the rate limiter or the deduplicator are counted, and the
+count is added to the next event of the same key as `suppressed`.
+"""
+import random
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Mapping, Tuple
+
+from structlog import DropEvent
+
+
+# The most event keys tracked at once, after which tracking starts over.
+MAX_KEYS = 4096
+
+EventDict = Dict[str, Any]
+
+
+def parse_rates(text: str) -> Dict[str, float]:
+    """
+    Parse sampling rates in the form `debug=0.01,info=0.5`.
+
+    >>> parse_rates("debug=0.01, INFO=0.5")
+    {'debug': 0.01, 'info': 0.5}
+    """
+    rates = {}
+    for pair in filter(None, (part.strip() for part in text.split(","))):
+        level, sep, rate = pair.partition("=")
+        if not sep:
+            raise ValueError(f"invalid sampling rate '{pair}', expected LEVEL=RATE")
+        rates[level.strip().lower()] = float(rate)
+    return rates
+
+
+class Sampler:
+    """
+    Keep a random fraction of the events of each level, marking the events
+    that were kept with their `sample_rate`.
+
+    Levels without a rate keep every event.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        self.rates = {level.lower(): rate for level, rate in rates.items() if rate < 1}
+
+    def __call__(self, logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+        rate = self.rates.get(event_dict.get("level", method_name))
+        if rate is None:
+            return event_dict
+        if random.random() >= rate:
+            raise DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+def _event_key(logger: Any, event_dict: EventDict) -> Tuple[Any, ...]:
+    return getattr(logger, "name", None), event_dict.get("level"), event_dict.get("event")
+
+
+class RateLimiter:
+    """
+    Allow `rate` events per second for each event key, in bursts of up to
+    `burst` events.
+
+    The key of an event is its logger name, level and event message.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        # key -> [tokens, last refill, suppressed]
+        self._buckets: Dict[Hashable, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+        key = _event_key(logger, event_dict)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= MAX_KEYS:
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                raise DropEvent
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            event_dict["suppressed"] = event_dict.get("suppressed", 0) + suppressed
+        return event_dict
+
+
+class Deduplicator:
+    """
+    Collapse identical events logged within `window` seconds of the first one
+    into that event, counting the duplicates on the next event logged after
+    the window.
+
+    Events are identical when their logger name and every key and value are.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        # key -> [window start, suppressed]
+        self._seen: Dict[Hashable, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+        key = (getattr(logger, "name", None), repr(sorted(event_dict.items())))
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.window:
+                seen[1] += 1
+                raise DropEvent
+            if seen is None and len(self._seen) >= MAX_KEYS:
+                self._seen.clear()
+            suppressed = seen[1] if seen is not None else 0
+            self._seen[key] = [now, 0]
+        if suppressed:
+            event_dict["suppressed"] = event_dict.get("suppressed", 0) + suppressed
+        return event_dict
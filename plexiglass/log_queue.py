@@ -0,0 +1,157 @@
+"""
+Hand log records to a background thread over a bounded queue, so that slow
+log output never blocks the threads doing the logging.
+
+.. code-block:: python
+
+    import logging
+
+    from plexiglass import log_queue
+
+    log_queue.start(logging.getLogger(), size=10000, overflow="drop-oldest")
+    ...
+    log_queue.stop()  # Also run at exit.
+"""
+import atexit
+from contextlib import suppress
+import copy
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import threading
+from typing import Any, List, Optional
+
+
+OVERFLOW_POLICIES = ["block", "drop-oldest", "drop-newest"]
+
+# The record that tells a QueueListener to stop.
+_SENTINEL = getattr(QueueListener, "_sentinel", None)
+
+_LISTENER: Optional["Listener"] = None
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Put records on a bounded queue, either waiting for room when it is full or
+    dropping the oldest or newest record and counting the drop.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]", overflow: str = "block") -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"invalid overflow policy '{overflow}'")
+        super().__init__(log_queue)
+        self.bounded_queue = log_queue
+        self.overflow = overflow
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def _drop(self) -> None:
+        with self._dropped_lock:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the % arguments now, while they hold the values they were
+        # logged with, and leave the rest of the formatting to the listener.
+        if record.args:
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block":
+            self.bounded_queue.put(record)
+            return
+        try:
+            self.bounded_queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow == "drop-newest":
+                self._drop()
+            else:
+                self._drop_oldest(record)
+
+    def _drop_oldest(self, record: logging.LogRecord) -> None:
+        """Make room for a record by discarding the oldest records."""
+        while True:
+            try:
+                oldest = self.bounded_queue.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                self._drop()
+                if oldest is _SENTINEL:
+                    # Never lose the listener's sentinel, drop the new record instead.
+                    self.bounded_queue.put(oldest)
+                    return
+            try:
+                self.bounded_queue.put_nowait(record)
+                return
+            except queue.Full:
+                continue
+
+
+class Listener(QueueListener):
+    """
+    Write queued records to the original handlers from a background thread.
+    """
+
+    def __init__(self, logger: logging.Logger, handler: BoundedQueueHandler, *handlers: logging.Handler) -> None:
+        super().__init__(handler.queue, *handlers, respect_handler_level=True)
+        self.logger = logger
+        self.handler = handler
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for room rather than losing the sentinel to a full queue, unless
+        # the thread is no longer there to make room.
+        while self._thread is not None and self._thread.is_alive():
+            with suppress(queue.Full):
+                self.handler.bounded_queue.put(_SENTINEL, timeout=0.1)
+                return
+
+    def stop(self) -> None:
+        """
+        Give the original handlers back to the logger, then write every queued
+        record and report any records that were dropped.
+        """
+        # Detach the queue first, so that no more records can crowd out the
+        # sentinel or be left behind it.
+        self.logger.removeHandler(self.handler)
+        for handler in self.handlers:
+            self.logger.addHandler(handler)
+        super().stop()
+        if self.handler.dropped:
+            record = logging.makeLogRecord(
+                {
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": f"dropped {self.handler.dropped} log records from a full log queue",
+                }
+            )
+            self.handle(record)
+
+
+def start(logger: logging.Logger, size: int = 10000, overflow: str = "block") -> BoundedQueueHandler:
+    """
+    Move the handlers of a logger (usually the root logger) behind a bounded
+    queue and start writing to them from a background thread.
+    """
+    global _LISTENER
+    stop()
+    handler = BoundedQueueHandler(queue.Queue(size), overflow)
+    handlers: List[logging.Handler] = list(logger.handlers)
+    for original in handlers:
+        logger.removeHandler(original)
+    logger.addHandler(handler)
+    _LISTENER = Listener(logger, handler, *handlers)
+    _LISTENER.start()
+    return handler
+
+
+@atexit.register
+def stop() -> None:
+    """Flush and stop the background thread, if one was started."""
+    global _LISTENER
+    if _LISTENER is not None:
+        listener, _LISTENER = _LISTENER, None
+        listener.stop()
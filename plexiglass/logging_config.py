@@ -34,12 +34,17 @@ The logging configuration code can be run without an argument parser as well.
 """
 import argparse
 from contextlib import suppress
+import datetime
+import json
 import logging
-import logging.config
-from typing import Any, Dict, Optional
+import sys
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, List, Optional
 
-import structlog
-from structlog.stdlib import LoggerFactory
+from plexiglass.argparse_config import Reloader
+from plexiglass.jot import _fast_json
 
 
 _LOG_LEVEL_STRINGS = ["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"]
@@ -58,6 +63,8 @@ _LOG_CONFIG: Dict[str, Any] = {
     "loggers": {"asyncio": {"level": "WARNING"}, "urllib3.connectionpool": {"level": "WARNING"}},
     "root": {"handlers": ["machine"], "level": "WARNING"},
 }
+# The root level of _LOG_CONFIG is replaced whenever logging is configured.
+_DEFAULT_LOG_LEVEL = _LOG_CONFIG["root"]["level"]
 
 
 def configure_parser(parser: argparse.ArgumentParser) -> None:
@@ -66,14 +73,53 @@ def configure_parser(parser: argparse.ArgumentParser) -> None:
     log_group.add_argument(
         "--log-level",
         choices=_LOG_LEVEL_STRINGS,
-        default=_LOG_CONFIG["root"]["level"],
+        default=_DEFAULT_LOG_LEVEL,
         help="Set the logging output level",
     )
     log_group.add_argument("-v", "--verbose", action="count", help="Enable verbose logging")
+    log_group.add_argument(
+        "--log-queue", action="store_true", help="Write logs from a background thread through a bounded queue"
+    )
+    log_group.add_argument("--log-queue-size", default=10000, type=int, help="Number of records the log queue holds")
+    log_group.add_argument(
+        "--log-queue-overflow",
+        choices=["block", "drop-oldest", "drop-newest"],
+        default="block",
+        help="Whether to wait for room in a full log queue or to drop its oldest or newest record",
+    )
+    log_group.add_argument(
+        "--log-sample", default="", help="Fraction of events to keep for each level, such as debug=0.01,info=0.1"
+    )
+    log_group.add_argument(
+        "--log-rate-limit", default=0.0, type=float, help="Events per second allowed for each event message (0 is off)"
+    )
+    log_group.add_argument(
+        "--log-rate-burst", default=10, type=int, help="Events allowed at once for each event message when rate limited"
+    )
+    log_group.add_argument(
+        "--log-record-level",
+        choices=_LOG_LEVEL_STRINGS,
+        default=None,
+        help="Keep recent events down to this level in memory, dumping them to the debug workspace on errors",
+    )
+    log_group.add_argument("--log-record-size", default=1000, type=int, help="Number of recent events to keep")
+    log_group.add_argument(
+        "--log-dedup-window",
+        default=0.0,
+        type=float,
+        help="Seconds during which identical events are collapsed into a count on the next one (0 is off)",
+    )
 
 
 def _configure_stdlib_logging(**kwargs: Any) -> None:
-    default_level = _LOG_CONFIG["root"]["level"]
+    import logging.config
+
+    from plexiglass import log_queue
+
+    # Flush any queue from an earlier configuration before its handlers are replaced.
+    log_queue.stop()
+
+    default_level = _DEFAULT_LOG_LEVEL
     log_level = kwargs.get("log_level", default_level)
 
     if log_level == default_level:
@@ -87,19 +133,208 @@ def _configure_stdlib_logging(**kwargs: Any) -> None:
         _LOG_CONFIG["root"]["level"] = log_level
 
     logging.config.dictConfig(_LOG_CONFIG)
+    if kwargs.get("log_queue", False):
+        log_queue.start(
+            logging.getLogger(), kwargs.get("log_queue_size", 10000), kwargs.get("log_queue_overflow", "block")
+        )
+
+
+# The processors of every structlog logger. Loggers are cached on first use
+# along with this list, so it is updated in place when logging is configured.
+_PROCESSORS: List[Callable[..., Any]] = []
+# Held while writing a line straight to stderr.
+_DIRECT_LOCK = threading.Lock()
+# The methods that write a rendered line.
+_LOG_METHODS = ("debug", "info", "warning", "warn", "error", "exception", "critical", "fatal")
+
+
+class _Logger:
+    """
+    Wrap a stdlib logger for structlog, writing each rendered line straight to
+    stderr in the JSONL mode instead of passing it through a LogRecord and the
+    stdlib handlers.
+
+    Otherwise every method is the stdlib logger's own, so that the caller's
+    frame is found for `%(funcName)s` and `%(lineno)d` as it would be without
+    the wrapper.
+    """
+
+    __slots__ = ("_logger", "name")
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self._logger = logger
+        self.name = logger.name
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._logger, name)
+
+    def _write(self, message: str, *args: Any, **kwargs: Any) -> None:
+        with _DIRECT_LOCK:
+            sys.stderr.write(message + "\n")
+
+    def _write_log(self, level: int, message: str, *args: Any, **kwargs: Any) -> None:
+        self._write(message)
+
+
+def _write_direct(direct: bool) -> None:
+    """Switch every _Logger between writing to stderr and to its stdlib logger."""
+    for name in _LOG_METHODS + ("log",):
+        if direct:
+            setattr(_Logger, name, _Logger._write_log if name == "log" else _Logger._write)
+        elif name in vars(_Logger):
+            delattr(_Logger, name)
+
+
+# The methods of each level, which do nothing while their level is disabled.
+_LEVEL_METHODS = {
+    logging.DEBUG: ("debug", "adebug"),
+    logging.INFO: ("info", "ainfo"),
+    logging.WARNING: ("warning", "warn", "awarning"),
+    logging.ERROR: ("error", "exception", "aerror", "aexception"),
+    logging.CRITICAL: ("critical", "fatal", "acritical", "afatal"),
+}
+_BOUND_LOGGER: Optional[type] = None
+# The level below which the methods of the wrapper class are no-ops.
+_NOP_LEVEL = logging.NOTSET
+
+
+def _nop(self: Any, event: Optional[str] = None, *args: Any, **kwargs: Any) -> None:
+    return None
 
 
-def _configure_structlog_logging(**kwargs: Any) -> None:
-    processors = [
+async def _anop(self: Any, event: Optional[str] = None, *args: Any, **kwargs: Any) -> None:
+    return None
+
+
+def _restore_levels(bound_logger: Any, level: int) -> None:
+    """Give a bound logger back the methods of the no-op levels at or above `level`."""
+    import structlog
+
+    base = structlog.stdlib.BoundLogger
+    for method_level, names in _LEVEL_METHODS.items():
+        if level <= method_level < _NOP_LEVEL:
+            for name in names:
+                if hasattr(base, name):
+                    setattr(bound_logger, name, types.MethodType(getattr(base, name), bound_logger))
+
+
+def _bound_logger(level: int) -> type:
+    """
+    Return the structlog wrapper class with the methods of every level below
+    `level` replaced by no-ops, so disabled log calls skip binding and the
+    processors entirely.
+
+    Loggers whose own level is lower when they are bound keep the methods
+    from there up, and leave them to `filter_by_level`. Loggers are cached
+    on first use, so the one class is updated in place.
+    """
+    global _BOUND_LOGGER, _NOP_LEVEL
+    if _BOUND_LOGGER is None:
+        import structlog
+
+        class BoundLogger(structlog.stdlib.BoundLogger):
+            """A stdlib BoundLogger whose disabled levels are no-ops."""
+
+            def __init__(self, *args: Any, **kwargs: Any) -> None:
+                super().__init__(*args, **kwargs)
+                logger_level = self._logger.getEffectiveLevel()
+                if logger_level < _NOP_LEVEL:
+                    _restore_levels(self, logger_level)
+
+        _BOUND_LOGGER = BoundLogger
+    _NOP_LEVEL = level
+    for method_level, names in _LEVEL_METHODS.items():
+        for name in names:
+            if method_level < level:
+                setattr(_BOUND_LOGGER, name, _anop if name.startswith("a") else _nop)
+            elif name in vars(_BOUND_LOGGER):
+                delattr(_BOUND_LOGGER, name)
+    return _BOUND_LOGGER
+
+
+# Replaced by structlog's LoggerFactory once logging is configured.
+_LOGGER_FACTORY: Callable[..., logging.Logger] = logging.getLogger
+
+
+def _logger_factory(*args: Any) -> _Logger:
+    return _Logger(_LOGGER_FACTORY(*args))
+
+
+class _TimeStamper:
+    """
+    Add an ISO 8601 UTC timestamp to an event, formatting the date and time
+    once per second.
+    """
+
+    def __init__(self) -> None:
+        # The second and its formatted prefix are replaced together, so that
+        # concurrent callers never see one without the other.
+        self._cached = (-1, "")
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        now = time.time()
+        second = int(now)
+        cached_second, prefix = self._cached
+        if second != cached_second:
+            prefix = datetime.datetime.fromtimestamp(second, datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self._cached = (second, prefix)
+        event_dict["timestamp"] = f"{prefix}.{int((now - second) * 1e6):06d}Z"
+        return event_dict
+
+
+def _dumps(event_dict: Dict[str, Any], default: Optional[Callable[[Any], Any]] = None, **kwargs: Any) -> str:
+    """Serialize an event with orjson when it is installed."""
+    orjson = _fast_json()
+    if orjson is not None:
+        with suppress(TypeError, orjson.JSONEncodeError):
+            line: str = orjson.dumps(event_dict, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+            return line
+    return json.dumps(event_dict, default=default, separators=(",", ":"), **kwargs)
+
+
+def _flow_control(**kwargs: Any) -> List[Callable[..., Any]]:
+    """Return the enabled sampling, rate limiting and deduplication processors."""
+    from plexiglass import log_filters
+
+    processors: List[Callable[..., Any]] = []
+    rates = log_filters.parse_rates(kwargs.get("log_sample") or "")
+    if rates:
+        processors.append(log_filters.Sampler(rates))
+    if kwargs.get("log_rate_limit"):
+        processors.append(log_filters.RateLimiter(kwargs["log_rate_limit"], kwargs.get("log_rate_burst", 10)))
+    if kwargs.get("log_dedup_window"):
+        processors.append(log_filters.Deduplicator(kwargs["log_dedup_window"]))
+    return processors
+
+
+def _configure_structlog_logging(cli_args: Optional[argparse.Namespace] = None, **kwargs: Any) -> None:
+    # structlog is only imported once logging is configured, so that tools
+    # which only parse their arguments start quickly.
+    import structlog
+
+    from plexiglass import flight_recorder
+
+    global _LOGGER_FACTORY
+    jsonl = kwargs.get("jsonl", False)
+    level = logging.getLevelName(_LOG_CONFIG["root"]["level"])
+    processors: List[Callable[..., Any]] = []
+    flight_recorder.stop()
+    if kwargs.get("log_record_level"):
+        # The recorder sees events before they are filtered by level.
+        record_level = logging.getLevelName(kwargs["log_record_level"])
+        processors.append(flight_recorder.start(cli_args, record_level, kwargs.get("log_record_size", 1000)))
+        level = min(level, record_level)
+    processors += [
         structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
-        structlog.processors.TimeStamper("iso"),
+        *_flow_control(**kwargs),
+        _TimeStamper() if jsonl else structlog.processors.TimeStamper("iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
     ]
-    if kwargs.get("jsonl", False):
-        processors.append(structlog.processors.JSONRenderer())
+    if jsonl:
+        processors.append(structlog.processors.JSONRenderer(serializer=_dumps))
     else:
         colors = False
         with suppress(ImportError):
@@ -108,8 +343,16 @@ def _configure_structlog_logging(**kwargs: Any) -> None:
             colors = True
         processors.append(structlog.dev.ConsoleRenderer(colors=colors))
 
+    # Queued logs are written by the queue's thread instead.
+    _write_direct(jsonl and not kwargs.get("log_queue", False))
+    # Loggers are named after the module calling get_logger, skipping this one.
+    _LOGGER_FACTORY = structlog.stdlib.LoggerFactory(ignore_frame_names=[__name__])
+    _PROCESSORS[:] = processors
     structlog.configure(
-        logger_factory=LoggerFactory(), processors=processors, wrapper_class=structlog.stdlib.BoundLogger
+        logger_factory=_logger_factory,
+        processors=_PROCESSORS,
+        wrapper_class=_bound_logger(level),
+        cache_logger_on_first_use=True,
     )
 
 
@@ -127,4 +370,25 @@ def configure_logging(cli_args: Optional[argparse.Namespace] = None, **kwargs: A
     if kwargs.get("jsonl", False):
         _LOG_CONFIG["root"]["handlers"] = ["machine"]
     _configure_stdlib_logging(**kwargs)
-    _configure_structlog_logging(**kwargs)
+    _configure_structlog_logging(cli_args, **kwargs)
+
+
+def watch(reloader: Reloader) -> None:
+    """
+    Configure logging again whenever a Reloader changes the
+    logging flags.
+    """
+    reloader.on_change(
+        [
+            "jsonl",
+            "log_level",
+            "verbose",
+            "log_sample",
+            "log_rate_limit",
+            "log_rate_burst",
+            "log_dedup_window",
+            "log_record_level",
+            "log_record_size",
+        ],
+        configure_logging,
+    )
@@ -6,10 +6,16 @@ https://nats-io.github.io/docs/
 import argparse
 from typing import Any, Optional
 
+from plexiglass.argparse_config import add_lazy_group, Reloader
+
 
 def configure_parser(parser: argparse.ArgumentParser, **kwargs: Any) -> None:
-    nats_group = parser.add_argument_group(
-        "NATS", "flags to control NATS integration", suppress_group=kwargs.get("suppress_group", True)
+    nats_group = add_lazy_group(
+        parser,
+        "NATS",
+        "flags to control NATS integration",
+        lazy=kwargs.get("lazy", True),
+        suppress_group=kwargs.get("suppress_group", True),
     )
     nats_group.add_argument("--nats-host", help="Address of a NATS server")
     nats_group.add_argument("--nats-port", help="Port of a NATS server", default=4222)
@@ -20,3 +26,10 @@ def configure_nats(cli_args: Optional[argparse.Namespace] = None, **kwargs: Any)
     if not cli_args:
         return
     setattr(cli_args, "nats_server", f"nats://{cli_args.nats_host}:{cli_args.nats_port}")
+
+
+def watch(reloader: Reloader) -> None:
+    """
+    Run `configure_nats` again whenever a Reloader changes its flags.
+    """
+    reloader.on_change(["nats_host", "nats_port"], configure_nats)
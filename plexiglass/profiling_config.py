@@ -0,0 +1,58 @@
+"""
+Configuration settings to profile a sampled fraction of the blocks wrapped by
+`plexiglass.time.profile`, writing the profiles into the debug workspace.
+
+.. code-block:: python
+
+    from plexiglass import argparse_config, profiling_config, workspace_config
+    from plexiglass.time import profile
+
+    parser = argparse_config.make_parser()
+    profiling_config.configure_parser(parser)
+    workspace_config.configure_parser(parser)
+
+    cli_args = parser.parse_args(argv)
+    workspace_config.configure_workspace(cli_args)
+    profiling_config.configure_profiling(cli_args)
+
+    @profile("handle")
+    def handle(request):
+        ...
+
+Like every flag, profiling can also be turned on through the environment, as
+in `PROFILE_RATE=0.01` (after the prefix of the parser, if it has one).
+"""
+import argparse
+from typing import Any, Optional
+
+from plexiglass import time
+from plexiglass.argparse_config import add_lazy_group, Reloader
+
+
+def configure_parser(parser: argparse.ArgumentParser, **kwargs: Any) -> None:
+    group = add_lazy_group(
+        parser,
+        "Profiling",
+        "flags to control sampled profiling",
+        lazy=kwargs.get("lazy", True),
+        suppress_group=kwargs.get("suppress_group", True),
+    )
+    group.add_argument(
+        "--profile-rate", default=0.0, type=float, help="Fraction of profiled blocks to run under cProfile (0 is off)"
+    )
+    group.add_argument(
+        "--profile-memory", action="store_true", help="Also save a tracemalloc snapshot of each sampled block"
+    )
+
+
+def configure_profiling(cli_args: Optional[argparse.Namespace] = None, **kwargs: Any) -> None:
+    if cli_args:
+        kwargs.update(vars(cli_args))
+    time.configure_profiling(kwargs.get("profile_rate", 0.0), kwargs.get("profile_memory", False), cli_args)
+
+
+def watch(reloader: Reloader) -> None:
+    """
+    Run `configure_profiling` again whenever a Reloader changes its flags.
+    """
+    reloader.on_change(["profile_rate", "profile_memory"], configure_profiling)
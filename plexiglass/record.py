@@ -0,0 +1,112 @@
+"""
+Generate compact record classes for large numbers of fixed-shape Jots.
+
+A record class is declared once from its field names or from a sample Jot. Its
+instances store their fields in `__slots__` instead of a per-instance
+`__dict__`, while keeping the attribute and item access, `merge` and `repr` of
+a Jot.
+
+.. code-block:: python
+
+    from plexiglass.record import make_record
+
+    Sample = make_record("Sample", ["sha256", "size", "tags"])
+
+    sample = Sample({"sha256": "...", "size": 10})
+    sample.tags = ["malware"]
+    sample["size"] += 1
+"""
+from functools import lru_cache
+import json
+from typing import Any, Dict, Iterable, Tuple, Type, Union
+
+from plexiglass.jot import _encode, Jot, resolve
+
+
+class Record:
+    __slots__: Tuple[str, ...] = ()
+
+    def __init__(self, data: Any = None, **kwargs: Any) -> None:
+        for field in self.__slots__:
+            setattr(self, field, None)
+        if data:
+            self.merge(data)
+        if kwargs:
+            self.merge(kwargs)
+
+    def merge(self, other: Any) -> None:
+        """
+        Merge a dict, Jot, record or JSON string into this one.
+
+        Nested dicts and Jots are merged into fields that already hold a Jot and
+        are otherwise copied into a new Jot. Unknown fields raise an AttributeError.
+        """
+        if isinstance(other, str):
+            other = json.loads(other)
+        items = other._view_().items() if hasattr(type(other), "_view_") else other.items()
+        for key, value in items:
+            if key not in self.__slots__:
+                raise AttributeError(f"'{type(self).__name__}' record has no field '{key}'")
+            current = getattr(self, key)
+            if isinstance(value, (dict, Jot)):
+                if isinstance(current, Jot):
+                    current.merge(value)
+                    continue
+                # Building the Jot already copies the value.
+                value = Jot(value)
+            else:
+                value = resolve(value)
+            setattr(self, key, value)
+
+    def _view_(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        if type(value) is dict:
+            value = Jot(value)
+        setattr(self, key, value)
+
+    def __repr__(self) -> str:
+        return json.dumps(self, default=_encode)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Generated classes cannot be found by name, so pickle the schema.
+        values = tuple(getattr(self, field) for field in self.__slots__)
+        return _unpickle, (type(self).__name__, self.__slots__, values)
+
+
+def _unpickle(name: str, fields: Tuple[str, ...], values: Tuple[Any, ...]) -> Record:
+    cls = _make_record(name, fields)
+    record = cls.__new__(cls)
+    for field, value in zip(fields, values):
+        setattr(record, field, value)
+    return record
+
+
+@lru_cache(maxsize=None)
+def _make_record(name: str, fields: Tuple[str, ...]) -> Type[Record]:
+    for field in fields:
+        if not field.isidentifier() or hasattr(Record, field):
+            raise ValueError(f"invalid record field '{field}'")
+    return type(name, (Record,), {"__slots__": fields})
+
+
+def make_record(name: str, schema: Union[Iterable[str], Jot]) -> Type[Record]:
+    """
+    Create (or get the previously created) record class with the given name
+    and fields. The fields are taken in order from an iterable of names or from
+    the keys of a sample dict or Jot.
+    """
+    if isinstance(schema, Jot):
+        schema = schema._view_()
+    return _make_record(name, tuple(schema))
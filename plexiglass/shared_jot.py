@@ -0,0 +1,99 @@
+"""
+Share a large, read-only Jot with process pool workers through shared memory.
+
+The Jot is frozen and pickled into a shared memory block once. The handle that
+is passed to workers pickles as just the name of the block, and each worker
+process loads the Jot from it the first time it is used and keeps it for every
+later task, instead of every task carrying and unpickling its own copy.
+
+.. code-block:: python
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    from plexiglass.shared_jot import SharedJot
+
+    def work(config, item):
+        return config.get().scale * item
+
+    with SharedJot(big_config) as config, ProcessPoolExecutor() as pool:
+        results = list(pool.map(work, [config] * 100, range(100)))
+
+Requires Python 3.8 or later for `multiprocessing.shared_memory`.
+"""
+import pickle
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+from plexiglass.jot import FrozenJot
+
+
+_HEADER = struct.Struct("<Q")
+_OFFSET = _HEADER.size
+# FrozenJots loaded into this process, by the name of their shared memory block.
+_ATTACHED: Dict[str, FrozenJot] = {}
+
+
+class SharedJot:
+    """
+    A handle to a FrozenJot stored in a shared memory block.
+
+    The process that creates the handle owns the block and should `unlink` it
+    (or use the handle as a context manager) once workers are done with it.
+    """
+
+    def __init__(self, data: Any = None, name: Optional[str] = None) -> None:
+        from multiprocessing import shared_memory
+
+        self._memory: Optional[Any] = None
+        if name is not None:
+            self.name = name
+            return
+
+        jot = FrozenJot(data)
+        payload = pickle.dumps(jot, protocol=pickle.HIGHEST_PROTOCOL)
+        self._memory = shared_memory.SharedMemory(create=True, size=_OFFSET + len(payload))
+        buf = self._memory.buf
+        assert buf is not None
+        _HEADER.pack_into(buf, 0, len(payload))
+        end = _OFFSET + len(payload)
+        buf[_OFFSET:end] = payload
+        self.name = self._memory.name
+        _ATTACHED[self.name] = jot
+
+    def get(self) -> FrozenJot:
+        """Get the Jot, loading it from shared memory once per process."""
+        try:
+            return _ATTACHED[self.name]
+        except KeyError:
+            pass
+
+        from multiprocessing import shared_memory
+
+        memory = shared_memory.SharedMemory(name=self.name)
+        try:
+            buf = memory.buf
+            assert buf is not None
+            (size,) = _HEADER.unpack_from(buf, 0)
+            end = _OFFSET + size
+            with buf[_OFFSET:end] as payload:
+                jot = pickle.loads(payload)
+        finally:
+            memory.close()
+        return _ATTACHED.setdefault(self.name, jot)
+
+    def unlink(self) -> None:
+        """Release the shared memory block from the process that created it."""
+        _ATTACHED.pop(self.name, None)
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def __enter__(self) -> "SharedJot":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.unlink()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return SharedJot, (None, self.name)
@@ -0,0 +1,78 @@
+"""
+Publish versioned, immutable snapshots of a Jot for many concurrent readers and
+a single writer.
+
+.. code-block:: python
+
+    from plexiglass.snapshot import VersionedJot
+
+    config = VersionedJot({"redis": {"host": "127.0.0.1"}})
+
+    # Readers never lock and always see a complete version.
+    version, snapshot = config.current()
+
+    # Writers build the next version from the current one and swap it in.
+    with config.edit() as draft:
+        draft.redis.host = "10.0.0.1"
+
+    if config.version != version:
+        ...
+"""
+from contextlib import contextmanager
+import threading
+from typing import Any, Iterator, Tuple
+
+from plexiglass.jot import FrozenJot, Jot
+
+
+class VersionedJot:
+    """
+    Hold the current version of a Jot as a FrozenJot.
+
+    The version number and snapshot are published together as a single tuple,
+    which is swapped atomically, so a reader always gets a matching pair
+    without taking a lock. Writers are serialized with a lock and each new
+    version shares every subtree it did not change with the previous one.
+    """
+
+    def __init__(self, data: Any = None) -> None:
+        self._lock = threading.Lock()
+        self._current: Tuple[int, FrozenJot] = (0, FrozenJot(data))
+
+    @property
+    def version(self) -> int:
+        return self._current[0]
+
+    @property
+    def snapshot(self) -> FrozenJot:
+        return self._current[1]
+
+    def current(self) -> Tuple[int, FrozenJot]:
+        """Get the current version number and snapshot together."""
+        return self._current
+
+    def _publish(self, data: Any) -> int:
+        version = self._current[0] + 1
+        self._current = (version, FrozenJot(data))
+        return version
+
+    def publish(self, data: Any) -> int:
+        """Replace the snapshot with a new Jot and return the new version."""
+        with self._lock:
+            return self._publish(data)
+
+    def update(self, other: Any) -> int:
+        """Merge `other` over the current snapshot and return the new version."""
+        with self._lock:
+            return self._publish(self._current[1](other, cow=True))
+
+    @contextmanager
+    def edit(self) -> Iterator[Jot]:
+        """
+        Yield a mutable copy-on-write draft of the current snapshot that is
+        published as the next version if the block exits without an error.
+        """
+        with self._lock:
+            draft = self._current[1](cow=True)
+            yield draft
+            self._publish(draft)
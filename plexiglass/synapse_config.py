@@ -4,9 +4,18 @@ import os
 from pathlib import Path
 from typing import Any, Callable
 
+from plexiglass.argparse_config import add_lazy_group
+from plexiglass.time import bounded_timeout, DeadlineExceeded
+
 
 def configure_parser(parser: argparse.ArgumentParser, **kwargs: Any) -> None:
-    synapse_group = parser.add_argument_group("Synapse", "flags to control Synapse integration", suppress_group=True)
+    synapse_group = add_lazy_group(
+        parser,
+        "Synapse",
+        "flags to control Synapse integration",
+        lazy=kwargs.get("lazy", True),
+        suppress_group=True,
+    )
 
     add_all = kwargs.get("synapse", False)
 
@@ -32,13 +41,28 @@ def configure_parser(parser: argparse.ArgumentParser, **kwargs: Any) -> None:
         )
 
 
-def syn_context(make_url: Callable[[argparse.Namespace], str], name: str) -> Callable:  # pragma: no cover
+def syn_context(make_url: Callable[[argparse.Namespace], str], name: str) -> Callable:
+    """
+    Open a telepath connection around each call of the decorated function.
+
+    Within a `plexiglass.time.Budget` or `Deadline`, the call fails fast with
+    `DeadlineExceeded` once nothing is left of it, and what is left is passed
+    to telepath as its own `timeout`.
+    """
+
     def outer_wrapper(function: Callable) -> Callable:
         @wraps(function)
         def wrapper(cli_args: argparse.Namespace, *args: Any, **kwargs: Any) -> Any:
             import synapse.telepath as s_telepath
 
-            with s_telepath.openurl(make_url(cli_args)) as context:
+            opts = {}
+            timeout = bounded_timeout()
+            if timeout is not None:
+                # The budget can run out between checking it and reading what is left.
+                if timeout <= 0:
+                    raise DeadlineExceeded("budget exhausted")
+                opts["timeout"] = timeout
+            with s_telepath.openurl(make_url(cli_args), **opts) as context:
                 kwargs[name] = context
                 return function(cli_args, *args, **kwargs)
 
@@ -1,8 +1,52 @@
-from contextlib import contextmanager
+import argparse
+from collections import deque
+from contextlib import ContextDecorator, contextmanager, suppress
+import contextvars
 import datetime
+import functools
+import heapq
+import itertools
+import logging
+import math
+import os
+import random
 import signal
+import sys
+import threading
+import time
 from timeit import default_timer
-from typing import Any, Iterator, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from plexiglass.jot import Jot
+
+
+# Histogram buckets split each power of two into _SUB_BUCKETS of equal ratio,
+# from about a nanosecond (2 ** _MIN_EXPONENT) to about twelve days
+# (2 ** _MAX_EXPONENT), so every histogram takes the same memory and estimates
+# within about 2%.
+_SUB_BUCKETS = 16
+_MIN_EXPONENT = -30
+_MAX_EXPONENT = 20
+_BUCKETS = (_MAX_EXPONENT - _MIN_EXPONENT) * _SUB_BUCKETS
+_LOWEST = 2.0**_MIN_EXPONENT
+_HIGHEST = 2.0**_MAX_EXPONENT
+# Measurements are queued and added to the buckets in batches of this size.
+_BATCH = 512
+_PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+_HISTOGRAMS: Dict[str, "Histogram"] = {}
+
+# How often `profile` runs a profiler and where it writes, see `profiling_config`.
+_PROFILING: Dict[str, Any] = {"rate": 0.0, "memory": False, "cli_args": None}
+# Only one block is profiled at a time.
+_PROFILE_LOCK = threading.Lock()
+_PROFILE_COUNTER = itertools.count()
+
+# The monotonic time of the innermost budget or deadline of the current context.
+_DEADLINE: "contextvars.ContextVar[float]" = contextvars.ContextVar("deadline", default=math.inf)
+# The monotonic time of the innermost deadline of the current context, which
+# unlike a budget is enforced.
+_ENFORCED: "contextvars.ContextVar[float]" = contextvars.ContextVar("enforced", default=math.inf)
 
 
 def timestamp(start: datetime.datetime = None, offset: int = 0) -> datetime.datetime:
@@ -13,21 +57,298 @@ def timestamp(start: datetime.datetime = None, offset: int = 0) -> datetime.date
     return start + delta
 
 
-@contextmanager
-def timer(*args: Any, **kwargs: Any) -> Iterator[List[float]]:
+class Histogram:
+    """
+    A thread-safe histogram of durations in seconds, with log-sized buckets.
+
+    Recording only appends to a queue, which is atomic, and the queue is added
+    to the buckets under a lock once it holds a batch or a snapshot is taken.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "buckets", "_pending", "_lock")
+
+    def __init__(self) -> None:
+        self._pending: Deque[float] = deque()
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = [0] * _BUCKETS
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._clear()
+
+    def record(self, value: float) -> None:
+        pending = self._pending
+        pending.append(value)
+        if len(pending) >= _BATCH:
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            pending = self._pending
+            batch = [pending.popleft() for _ in range(len(pending))]
+            if not batch:
+                return
+            low, high = min(batch), max(batch)
+            self.count += len(batch)
+            self.total += sum(batch)
+            self.min = min(self.min, low)
+            self.max = max(self.max, high)
+            buckets = self.buckets
+            offset = _MIN_EXPONENT * _SUB_BUCKETS
+            if _LOWEST <= low and high < _HIGHEST:
+                for value in batch:
+                    buckets[math.floor(math.log2(value) * _SUB_BUCKETS) - offset] += 1
+            else:
+                for value in batch:
+                    index = math.floor(math.log2(value) * _SUB_BUCKETS) - offset if value > 0 else 0
+                    buckets[min(max(index, 0), _BUCKETS - 1)] += 1
+
+    def _percentile(self, fraction: float) -> float:
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                break
+        # The geometric middle of the bucket, within the values actually seen.
+        middle: float = 2.0 ** ((index + 0.5) / _SUB_BUCKETS + _MIN_EXPONENT)
+        return min(max(middle, self.min), self.max)
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Any]:
+        """Get the count, sum, min, max and percentiles, optionally starting over."""
+        self._flush()
+        with self._lock:
+            stats = {"count": self.count, "sum": self.total, "min": self.min, "max": self.max}
+            stats.update((key, self._percentile(fraction)) for key, fraction in _PERCENTILES.items())
+            if reset:
+                self._clear()
+        return stats
+
+
+def histogram(name: str) -> Histogram:
+    """Get the histogram registered under `name`, creating it if needed."""
+    result = _HISTOGRAMS.get(name)
+    if result is None:
+        result = _HISTOGRAMS.setdefault(name, Histogram())
+    return result
+
+
+def snapshot(reset: bool = False) -> Jot:
+    """
+    Get the statistics of every named timer that has recorded a duration,
+    optionally starting them over.
+    """
+    stats = {name: hist.snapshot(reset) for name, hist in sorted(list(_HISTOGRAMS.items()))}
+    return Jot({name: values for name, values in stats.items() if values["count"]})
+
+
+def reset() -> None:
+    """Start every named timer over."""
+    for hist in list(_HISTOGRAMS.values()):
+        hist.reset()
+
+
+class _Timer:
+    # A plain slotted class: ContextDecorator has no __slots__, so instances of
+    # its subclasses would still get a __dict__.
+    __slots__ = ("histogram", "result", "start")
+
+    def __init__(self, histogram: Optional[Histogram]) -> None:
+        self.histogram = histogram
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        histogram = self.histogram
+
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            # Each decorated call gets its own timer.
+            with _Timer(histogram):
+                return func(*args, **kwargs)
+
+        return timed
+
+    def __enter__(self) -> List[float]:
+        self.result: List[float] = []
+        self.start = default_timer()
+        return self.result
+
+    def __exit__(self, *exc_info: Any) -> None:
+        elapsed = default_timer() - self.start
+        self.result.append(elapsed)
+        histogram = self.histogram
+        if histogram is not None:
+            # Histogram.record, inlined.
+            pending = histogram._pending
+            pending.append(elapsed)
+            if len(pending) >= _BATCH:
+                histogram._flush()
+
+
+def timer(name: Optional[str] = None, *args: Any, **kwargs: Any) -> _Timer:
     """
     Yields a list that can be mutated during the execution of the timer
     context manager.
 
     The resulting list will have a single entry that represents the elapsed time.
+
+    A named timer also records the elapsed time in the histogram of that name,
+    see `snapshot`. Timers can decorate functions as well.
+
+    Each measurement costs about 0.75 usec without a name and 1.1 usec with
+    one, of which reading the clock twice around an empty `with` block takes
+    about 0.4 usec (benchmarks/bench_time.py, on a machine where an empty
+    `with` block takes 0.35 usec). Timers suit blocks that take tens of
+    microseconds or more.
     """
-    result: List[float] = []
-    try:
-        start = default_timer()
-        yield result
-    finally:
-        end = default_timer()
-        result.append(end - start)
+    if name is None:
+        return _Timer(None)
+    return _Timer(_HISTOGRAMS.get(name) or histogram(name))
+
+
+class TimerEmitter:
+    """
+    Log a snapshot of the named timers every `interval` seconds from a daemon
+    thread, through the structlog configuration of `logging_config`.
+
+    .. code-block:: python
+
+        emitter = TimerEmitter()
+        emitter.start(interval=60)
+    """
+
+    def __init__(self, reset: bool = True) -> None:
+        self.reset = reset
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def emit(self) -> None:
+        """Log one event for each named timer."""
+        import structlog
+
+        log = structlog.get_logger(__name__)
+        for name, stats in snapshot(self.reset)._view_().items():
+            log.info("timer", timer=name, **stats._view_())
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.emit()
+
+    def start(self, interval: float = 60.0) -> None:
+        """Emit the timers every `interval` seconds from a daemon thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="timer-emitter", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread, emitting whatever was recorded since the last emit."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.emit()
+
+
+def configure_profiling(rate: float = 0.0, memory: bool = False, cli_args: Optional[argparse.Namespace] = None) -> None:
+    """
+    Profile a `rate` fraction of the blocks wrapped by `profile`, also taking
+    tracemalloc snapshots with `memory`, and write the results to the debug
+    workspace of `cli_args`. A rate of 0 turns profiling off.
+    """
+    _PROFILING.update(rate=rate, memory=memory, cli_args=cli_args)
+
+
+class _Profile(ContextDecorator):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.profiler: Optional[Any] = None
+        self.memory = False
+        self.tracing = False
+
+    def _recreate_cm(self) -> "_Profile":
+        # Each decorated call gets its own profiler.
+        return _Profile(self.name)
+
+    def __enter__(self) -> "_Profile":
+        rate = _PROFILING["rate"]
+        if rate <= 0 or random.random() >= rate or not _PROFILE_LOCK.acquire(blocking=False):
+            return self
+        import cProfile
+        import tracemalloc
+
+        profiler = cProfile.Profile()
+        self.memory = _PROFILING["memory"]
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            self.tracing = True
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active.
+            self._finish()
+            return self
+        self.profiler = profiler
+        return self
+
+    def _finish(self) -> None:
+        if self.tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self.tracing = False
+        _PROFILE_LOCK.release()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            return
+        profiler.disable()
+        try:
+            self._write(profiler)
+        finally:
+            self._finish()
+
+    def _write(self, profiler: Any) -> None:
+        import marshal
+        import pickle
+        import tracemalloc
+
+        from plexiglass import workspace
+
+        cli_args = _PROFILING["cli_args"]
+        if "debug" not in getattr(cli_args, "workspace_dirs", {}):
+            return
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S")
+        prefix = f"profile-{self.name}-{stamp}-{os.getpid()}-{next(_PROFILE_COUNTER)}"
+        # The same format as Profile.dump_stats, readable with pstats.
+        profiler.create_stats()
+        with workspace.createfile(cli_args, "debug", f"{prefix}.prof") as profile_file:
+            marshal.dump(profiler.stats, profile_file)
+        if self.memory and tracemalloc.is_tracing():
+            # The same format as Snapshot.dump, readable with Snapshot.load.
+            with workspace.createfile(cli_args, "debug", f"{prefix}.tracemalloc") as snapshot_file:
+                pickle.dump(tracemalloc.take_snapshot(), snapshot_file, pickle.HIGHEST_PROTOCOL)
+
+
+def profile(name: str) -> _Profile:
+    """
+    Profile a sampled fraction of the runs of a block or decorated function
+    with cProfile, writing `profile-{name}-*.prof` files, which `pstats` reads,
+    into the debug workspace.
+
+    Profiling is off until it is enabled with `configure_profiling`, usually
+    through the flags of `profiling_config`, and costs about as much as an
+    unnamed `timer` while it is off.
+    """
+    return _Profile(name)
 
 
 @contextmanager
@@ -39,6 +360,9 @@ def Timeout(seconds: Optional[int]):
 
     If an alarm handler is already present, behave as a noop and allow the
     incumbent handler precedence.
+
+    See `Deadline` for sub-second timeouts that nest and work from any thread
+    or coroutine.
     """
     if seconds is None:
         try:
@@ -63,3 +387,248 @@ def Timeout(seconds: Optional[int]):
             signal.alarm(0)
             # Restore the original signal handler.
             signal.signal(signal.SIGALRM, original_handler)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised in the thread or task whose `Deadline` expired."""
+
+
+def _async_raise(thread_id: int, exception: Optional[type]) -> None:
+    """Raise `exception` in another thread, or clear it when it is None."""
+    import ctypes
+
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id), ctypes.py_object(exception) if exception else None
+    )
+
+
+class _Scheduler:
+    """
+    Expire deadlines from a single daemon thread, using a heap ordered by
+    expiry.
+
+    Deadlines that end before they expire are only marked, and are dropped as
+    they reach the top of the heap or when they make up most of it.
+    """
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+        self._reset()
+
+    def _reset(self) -> None:
+        # A forked child has no scheduler thread, and may have inherited the
+        # lock while another thread held it.
+        self.heap: List[Tuple[float, int, "Deadline"]] = []
+        self.lock = threading.Condition()
+        self._cancelled = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, deadline: "Deadline") -> None:
+        with self.lock:
+            heapq.heappush(self.heap, (deadline.when, next(self._counter), deadline))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="deadlines", daemon=True)
+                self._thread.start()
+            elif self.heap[0][2] is deadline:
+                self.lock.notify()
+
+    def cancel(self, deadline: "Deadline") -> None:
+        # Called with the lock held.
+        deadline.cancelled = True
+        self._cancelled += 1
+        if self._cancelled > 1024 and self._cancelled * 2 > len(self.heap):
+            self.heap = [entry for entry in self.heap if not entry[2].cancelled]
+            heapq.heapify(self.heap)
+            self._cancelled = 0
+
+    def _run(self) -> None:
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                while self.heap and self.heap[0][0] <= now:
+                    deadline = heapq.heappop(self.heap)[2]
+                    if deadline.cancelled:
+                        self._cancelled -= 1
+                    else:
+                        deadline.expired = True
+                        try:
+                            deadline._expire()
+                        except Exception:
+                            # E.g. the event loop of an abandoned task was closed.
+                            logging.getLogger(__name__).exception("could not expire a deadline")
+                self.lock.wait(self.heap[0][0] - now if self.heap else None)
+
+
+_SCHEDULER = _Scheduler()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_SCHEDULER._reset)
+
+
+class Budget:
+    """
+    Give the current context `seconds` to finish in, without enforcing it, so
+    that nested code can bound its own timeouts by what is left.
+
+    Budgets and deadlines nest, and the earliest of them applies.
+
+    .. code-block:: python
+
+        with Budget(2.0):
+            first_hop(timeout=bounded_timeout(1.0))
+            # Raises DeadlineExceeded if the first hop used up the budget.
+            second_hop(timeout=bounded_timeout(1.0))
+    """
+
+    def __init__(self, seconds: Optional[float]) -> None:
+        if seconds is not None and seconds <= 0:
+            raise ValueError(f"Cannot create a {type(self).__name__} for 0 seconds or less.")
+        self.seconds = seconds
+        self.when = math.inf
+        self._token: Optional[contextvars.Token] = None
+
+    def remaining(self) -> float:
+        """Get the seconds left before the innermost budget or deadline ends."""
+        return max(0.0, min(self.when, _DEADLINE.get()) - time.monotonic())
+
+    def __enter__(self) -> "Budget":
+        if self.when != math.inf:
+            raise RuntimeError(f"A {type(self).__name__} cannot be entered more than once.")
+        if self.seconds is not None:
+            self.when = time.monotonic() + self.seconds
+            if self.when < _DEADLINE.get():
+                self._token = _DEADLINE.set(self.when)
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc: Optional[BaseException], traceback: Any) -> None:
+        if self._token is not None:
+            _DEADLINE.reset(self._token)
+            self._token = None
+
+    async def __aenter__(self) -> "Budget":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type: Optional[type], exc: Optional[BaseException], traceback: Any) -> None:
+        self.__exit__(exc_type, exc, traceback)
+
+
+def budget_remaining() -> Optional[float]:
+    """Get the seconds left in the current budget or deadline, if there is one."""
+    when = _DEADLINE.get()
+    return None if when == math.inf else max(0.0, when - time.monotonic())
+
+
+def check_budget() -> None:
+    """Raise `DeadlineExceeded` if the current budget or deadline has run out."""
+    if _DEADLINE.get() <= time.monotonic():
+        raise DeadlineExceeded("budget exhausted")
+
+
+def bounded_timeout(timeout: Optional[float] = None) -> Optional[float]:
+    """
+    Get `timeout` bounded by what is left of the current budget, failing fast
+    with `DeadlineExceeded` if nothing is left.
+    """
+    check_budget()
+    remaining = budget_remaining()
+    if remaining is None or (timeout is not None and timeout < remaining):
+        return timeout
+    return remaining
+
+
+class Deadline(Budget):
+    """
+    Raise `DeadlineExceeded` (a `TimeoutError`) in the current thread or asyncio
+    task once `seconds` have passed, unless the block has finished by then.
+
+    Deadlines nest, and the earliest of the enclosing deadlines applies. A
+    deadline that would end later than an enclosing deadline costs nothing.
+    An enclosing budget that ends earlier only shortens `remaining`, and does
+    not keep the deadline from being enforced.
+
+    .. code-block:: python
+
+        with Deadline(0.25):
+            handle(request)
+
+        async with Deadline(0.25):
+            await handle(request)
+
+    In threads, the exception is raised the next time the thread runs Python
+    code, so a blocking call such as `time.sleep` or a socket read finishes
+    first. Tasks are cancelled at their next `await`.
+
+    The exception is raised wherever the thread happens to be, which can be
+    inside a `finally` block or the `__exit__` of another context manager
+    within the deadline, cutting its cleanup short. Keep cleanup that must
+    run outside of the deadline, or pass timeouts to blocking calls instead.
+
+    Deadlines entered before `os.fork` do not expire in the child process.
+    """
+
+    def __init__(self, seconds: Optional[float]) -> None:
+        super().__init__(seconds)
+        self.cancelled = False
+        self.expired = False
+        self._enforced: Optional[contextvars.Token] = None
+        self._thread_id: Optional[int] = None
+        # The asyncio task and event loop, when entered from a coroutine.
+        self._task: Optional[Any] = None
+        self._loop: Optional[Any] = None
+
+    def _expire(self) -> None:
+        # Called by the scheduler with its lock held.
+        if self._task is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._cancel_task)
+        elif self._thread_id is not None:
+            _async_raise(self._thread_id, DeadlineExceeded)
+
+    def _cancel_task(self) -> None:
+        if not self.cancelled and self._task is not None:
+            self._task.cancel()
+
+    def __enter__(self) -> "Deadline":
+        super().__enter__()
+        if self.when < _ENFORCED.get():
+            self._enforced = _ENFORCED.set(self.when)
+            # There is no event loop running unless asyncio was imported.
+            asyncio = sys.modules.get("asyncio")
+            if asyncio is not None:
+                with suppress(RuntimeError):
+                    self._loop = asyncio.get_running_loop()
+                    self._task = asyncio.current_task()
+            if self._task is None:
+                self._thread_id = threading.get_ident()
+            _SCHEDULER.add(self)
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc: Optional[BaseException], traceback: Any) -> None:
+        if self._enforced is None:
+            super().__exit__(exc_type, exc, traceback)
+            return
+        try:
+            # Cancel first, so that the deadline cannot expire once the
+            # context is reset.
+            with _SCHEDULER.lock:
+                expired = self.expired
+                if not expired:
+                    _SCHEDULER.cancel(self)
+                elif self._task is None and exc_type is not DeadlineExceeded:
+                    # Expired as the block finished, before the exception was raised.
+                    _async_raise(threading.get_ident(), None)
+                self.cancelled = True
+        finally:
+            _ENFORCED.reset(self._enforced)
+            self._enforced = None
+            super().__exit__(exc_type, exc, traceback)
+        if not expired or exc_type is DeadlineExceeded:
+            return
+        cancelled = False
+        if self._task is not None:
+            # Take back the cancellation, which Python 3.11 and later count.
+            uncancel = getattr(self._task, "uncancel", None)
+            if uncancel is not None:
+                uncancel()
+            cancelled = exc_type is sys.modules["asyncio"].CancelledError
+        if exc_type is None or cancelled:
+            raise DeadlineExceeded(f"deadline of {self.seconds} seconds exceeded") from exc
@@ -1,20 +1,118 @@
-from contextlib import suppress
+from contextlib import contextmanager, suppress
+import os
 from pathlib import Path
-from typing import Optional
+import threading
+import time
+from typing import Dict, IO, Iterator, List, Optional
 import uuid
 
 
+# The owner IDs read or written by get_uuid, by path.
+_PATH_UUIDS: Dict[str, str] = {}
+_PATH_LOCK = threading.Lock()
+
+# The state of the sortable IDs: the last millisecond used and the 74 bit
+# counter that follows it.
+_SORTABLE_LOCK = threading.Lock()
+_SORTABLE_STATE = [-1, 0]
+_COUNTER_BITS = 74
+_RAND_B_BITS = 62
+_RAND_B_MASK = (1 << _RAND_B_BITS) - 1
+_VERSION_AND_VARIANT = (0x7 << 76) | (0b10 << 62)
+
+
+@contextmanager
+def _file_lock(id_file: IO[str]) -> Iterator[None]:
+    """Hold an exclusive lock on an open file, where fcntl exists."""
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover
+        yield
+        return
+    fcntl.flock(id_file, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        # Written before anyone else can read it.
+        id_file.flush()
+        fcntl.flock(id_file, fcntl.LOCK_UN)
+
+
 def get_uuid(path: Optional[Path] = None) -> str:
     """
     Generate a uuid value.
 
-    If a path is provided, use it as a lookup and cache destination.
+    If a path is provided, use it as a lookup and cache destination. The value
+    is read once per process, and first written under a lock on the file
+    itself so that processes sharing the path agree on it.
     """
-    result = uuid.uuid4().hex
-    if path is not None:
-        with suppress(FileNotFoundError):
-            read_result = path.read_text().strip()
-            if read_result:
-                result = read_result
-        path.write_text(result)
+    if path is None:
+        return uuid.uuid4().hex
+    key = os.path.abspath(path)
+    with suppress(KeyError):
+        return _PATH_UUIDS[key]
+    with _PATH_LOCK:
+        # Opened for appending, so that an existing value is not truncated
+        # before the lock is held.
+        with open(path, "a+") as id_file, _file_lock(id_file):
+            id_file.seek(0)
+            result = id_file.read().strip()
+            if not result:
+                result = uuid.uuid4().hex
+                id_file.truncate(0)
+                id_file.write(result)
+        _PATH_UUIDS[key] = result
     return result
+
+
+def _reset_after_fork() -> None:
+    global _PATH_LOCK, _SORTABLE_LOCK
+    # A forked child may inherit the locks while another thread held them, and
+    # must not continue the counter of its parent.
+    _PATH_LOCK = threading.Lock()
+    _SORTABLE_LOCK = threading.Lock()
+    _SORTABLE_STATE[:] = [-1, 0]
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_sortable_ids(count: int) -> List[str]:
+    """
+    Generate `count` UUIDv7 hex values, which sort in the order they were
+    generated within a process and by millisecond across processes.
+
+    Each millisecond starts the counter below the timestamp at a random value,
+    and every ID within the same millisecond increments it. Should the clock
+    go back or the counter run out, the timestamp of the last ID is kept or
+    moved ahead by one.
+    """
+    with _SORTABLE_LOCK:
+        millis = time.time_ns() // 1_000_000
+        last_millis, counter = _SORTABLE_STATE
+        if millis > last_millis:
+            # Leave the top bit clear, so that a burst has room to count up.
+            counter = int.from_bytes(os.urandom(10), "big") >> (80 - _COUNTER_BITS + 1)
+        else:
+            millis = last_millis
+            counter += 1
+        if counter + count > 1 << _COUNTER_BITS:
+            millis, counter = millis + 1, 0
+        _SORTABLE_STATE[:] = [millis, counter + count - 1]
+
+    prefix = (millis << 80) | _VERSION_AND_VARIANT
+    ids = []
+    for value in range(counter, counter + count):
+        ids.append(f"{prefix | ((value >> _RAND_B_BITS) << 64) | (value & _RAND_B_MASK):032x}")
+    return ids
+
+
+def get_sortable_id() -> str:
+    """Generate a single UUIDv7 hex value, see `get_sortable_ids`."""
+    return get_sortable_ids(1)[0]
+
+
+def sortable_id_time(value: str) -> float:
+    """Get the Unix time in seconds, to the millisecond, of a sortable ID."""
+    return (int(value, 16) >> 80) / 1000
@@ -10,7 +10,11 @@ from pathlib import Path
 import shutil
 import tempfile
 import time
-from typing import IO, Iterator, Optional
+from typing import Callable, IO, Iterator, List, Optional
+
+
+# Called with the parsed arguments whenever the error flag is set.
+_ERROR_FLAG_CALLBACKS: List[Callable[[argparse.Namespace], None]] = []
 
 
 class WorkspaceError(Exception):
@@ -68,3 +72,14 @@ def set_error_flag(cli_args: argparse.Namespace) -> None:  # pragma: no cover
     """
     with (cli_args.workspace_dirs.debug / "error").open("w"):
         pass
+    for callback in _ERROR_FLAG_CALLBACKS:
+        callback(cli_args)
+
+
+def on_error_flag(callback: Callable[[argparse.Namespace], None]) -> None:
+    """
+    Call `callback` with the parsed arguments whenever the error flag is set,
+    such as to save debugging context alongside it.
+    """
+    if callback not in _ERROR_FLAG_CALLBACKS:
+        _ERROR_FLAG_CALLBACKS.append(callback)
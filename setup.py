@@ -37,7 +37,7 @@ setup(
     packages=['plexiglass'],
     package_dir={"": "."},
     package_data={},
-    install_requires=['structlog>=18.2.0'],
+    install_requires=['structlog>=18.2.0', 'tomli; python_version<"3.11"'],
     extras_require={
         "dev": [
             "colorama", "pytest", "pytest-black", "pytest-cov", "pytest-flake8"
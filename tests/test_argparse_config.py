@@ -1,12 +1,27 @@
 import argparse
 from contextlib import suppress
+import json
 import os
+from pathlib import Path
 import sys
 import tempfile
+import time
 from typing import Any
 from unittest.mock import patch
 
-from plexiglass import argparse_config, dgraph_config, hashi_config, logging_config, synapse_config, workspace_config
+import pytest
+
+from plexiglass import (
+    argparse_config,
+    dgraph_config,
+    hashi_config,
+    logging_config,
+    nats_config,
+    redis_config,
+    sonic_config,
+    synapse_config,
+    workspace_config,
+)
 
 
 def test_type() -> None:
@@ -112,3 +127,195 @@ def test_all_configs() -> None:
         cli_args = parser.parse_args(["--workspace-dir", tmpdir])
         logging_config.configure_logging(cli_args)
         workspace_config.configure_workspace(cli_args)
+
+
+def test_sources(monkeypatch: Any) -> None:
+    """
+    Defaults are layered from files, below the environment and the command line.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        monkeypatch.setattr(argparse_config, "_CACHE_DIR", Path(tmpdir) / "cache")
+        toml = Path(tmpdir, "test.toml")
+        toml.write_text('[test]\nfirst-flag = 1\nsecond-flag = 1\nthird-flag = 1\n\n[consul]\nhost = "10.0.0.1"\n')
+        dotenv = Path(tmpdir, ".env")
+        dotenv.write_text("# comment\nexport TEST_SECOND_FLAG=2\nTEST_THIRD_FLAG='2'\n")
+        sources = [toml, dotenv, Path(tmpdir, "missing.json")]
+
+        with patch.dict(os.environ, {"TEST_THIRD_FLAG": "3"}):
+            parser = argparse_config.make_parser("TEST", sources=sources)
+            parser.add_argument("--first-flag", type=int)
+            parser.add_argument("--second-flag", type=int)
+            parser.add_argument("--third-flag", type=int)
+            hashi_config.configure_parser(parser, consul=True)
+            cli_args = parser.parse_args(["--first-flag", "0"])
+        assert cli_args.first_flag == 0
+        assert cli_args.second_flag == 2
+        assert cli_args.third_flag == 3
+        # Argument groups share the sources of their parser.
+        assert cli_args.consul_host == "10.0.0.1"
+
+        # Other processes reuse the parsed files until they change.
+        argparse_config._SOURCES.clear()
+        with patch.object(argparse_config, "_parse_source", side_effect=AssertionError):
+            assert argparse_config.load_sources(sources) == parser.sources
+        dotenv.write_text("TEST_SECOND_FLAG=22\n")
+        assert argparse_config.load_sources(sources).TEST_SECOND_FLAG == "22"
+        config = Path(tmpdir, "test.json")
+        config.write_text('{"test": {"second_flag": [1, 2]}}')
+        assert argparse_config.load_source(config) == {"TEST_SECOND_FLAG": [1, 2]}
+
+        # Cached files that anyone else could have written are ignored.
+        (cache,) = [
+            path for path in Path(tmpdir, "cache").iterdir() if json.loads(path.read_text())["path"] == str(config)
+        ]
+        forged = json.loads(cache.read_text())
+        forged["values"] = {"TEST_SECOND_FLAG": "forged"}
+        cache.write_text(json.dumps(forged))
+        argparse_config._SOURCES.clear()
+        assert argparse_config.load_source(config) == {"TEST_SECOND_FLAG": "forged"}
+        cache.chmod(0o666)
+        argparse_config._SOURCES.clear()
+        assert argparse_config.load_source(config) == {"TEST_SECOND_FLAG": [1, 2]}
+
+    # Users without a name get a cache directory by their uid.
+    monkeypatch.setattr(argparse_config, "_CACHE_DIR", None)
+    with patch("getpass.getuser", side_effect=KeyError):
+        assert argparse_config._cache_dir().name == f"plexiglass-cache-{os.getuid()}"
+
+
+def test_lazy_groups() -> None:
+    """
+    Integration groups are only built once they are used.
+    """
+    parser = argparse_config.make_parser("TEST")
+    nats_config.configure_parser(parser)
+    redis_config.configure_parser(parser)
+    hashi_config.configure_parser(parser, consul=True, nomad=True)
+    sonic_config.configure_parser(parser, lazy=False)
+    assert all(not group.built for group in parser._lazy_groups)
+
+    with patch.dict(os.environ, {"CONSUL_HOST": "10.0.0.1"}):
+        # Long options may be abbreviated.
+        cli_args = parser.parse_args(["--nats-h", "10.0.0.2"])
+    built = {group.group.title for group in parser._lazy_groups if group.built}
+    assert built == {"NATS", "Consul"}
+    assert cli_args.nats_host == "10.0.0.2"
+    assert cli_args.consul_host == "10.0.0.1"
+    assert cli_args.sonic_port == "1491"
+
+    # Defaults of the remaining groups are filled in without building them.
+    assert vars(cli_args)["redis_host"] == "127.0.0.1"
+    assert cli_args.redis_db == "0"
+    assert not hasattr(cli_args, "missing")
+    assert not any(group.built for group in parser._lazy_groups if group.group.title == "Redis")
+    assert parser.get_default("redis_port") == "6379"
+
+    # Including into a given namespace, and by subparsers.
+    assert parser.parse_args([], namespace=argparse.Namespace()).nomad_port == "4646"
+    commands = argparse_config.make_parser("TEST")
+    redis_config.configure_parser(commands.add_subparsers(dest="command").add_parser("run"))
+    assert commands.parse_args(["run"]).redis_host == "127.0.0.1"
+
+    # Parents pass on every group, and the usage shows them.
+    common = argparse_config.make_parser("TEST")
+    nats_config.configure_parser(common)
+    child = argparse.ArgumentParser(parents=[common], add_help=False)
+    assert child.parse_args(["--nats-host", "10.0.0.3"]).nats_host == "10.0.0.3"
+    usage_parser = argparse_config.make_parser("TEST")
+    nats_config.configure_parser(usage_parser)
+    assert "--nats-host" in usage_parser.format_usage()
+
+    # The full help shows every group.
+    with patch.object(sys, "argv", [__name__, "--help"]):
+        assert "Nomad" in parser.format_help()
+    assert all(group.built for group in parser._lazy_groups)
+
+
+def test_reloader() -> None:
+    """
+    Changed sources update the arguments not given on the command line.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dotenv = Path(tmpdir, ".env")
+        dotenv.write_text("NATS_HOST=10.0.0.1\n")
+        parser = argparse_config.make_parser("TEST", sources=[dotenv])
+        logging_config.configure_parser(parser)
+        nats_config.configure_parser(parser, lazy=False)
+        argv = ["--nats-p", "4000"]
+        cli_args = parser.parse_args(argv)
+        nats_config.configure_nats(cli_args)
+        assert cli_args.nats_server == "nats://10.0.0.1:4000"
+
+        reloader = argparse_config.Reloader(parser, cli_args, argv)
+        logging_config.watch(reloader)
+        nats_config.watch(reloader)
+        assert reloader.poll() == []
+
+        dotenv.write_text("NATS_HOST=10.0.0.2\nNATS_PORT=5000\nLOG_LEVEL=DEBUG\n")
+        assert sorted(reloader.poll()) == ["log_level", "nats_host"]
+        assert cli_args.nats_server == "nats://10.0.0.2:4000"
+        assert logging_config._LOG_CONFIG["root"]["level"] == "DEBUG"
+        assert reloader.poll() == []
+
+        with patch.dict(os.environ, {"LOG_LEVEL": "ERROR"}):
+            reloader.start(interval=0.01)
+            for _ in range(100):
+                if cli_args.log_level == "ERROR":
+                    break
+                time.sleep(0.01)
+            reloader.stop()
+        assert cli_args.log_level == "ERROR"
+        assert logging_config._LOG_CONFIG["root"]["level"] == "ERROR"
+
+        # Combined short options count as given.
+        argv = ["-vv"]
+        cli_args = parser.parse_args(argv)
+        reloader = argparse_config.Reloader(parser, cli_args, argv)
+        dotenv.write_text("NATS_HOST=10.0.0.3\nLOG_LEVEL=ERROR\n")
+        assert reloader.poll() == ["nats_host"]
+        assert cli_args.verbose == 2
+
+
+def test_reloader_errors() -> None:
+    """
+    Values that cannot be resolved update nothing, and are tried again.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dotenv = Path(tmpdir, ".env")
+        dotenv.write_text("TEST_WORKERS=2\n")
+        parser = argparse_config.make_parser("TEST", sources=[dotenv])
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--mode", choices=["fast", "slow"], default="fast")
+        cli_args = parser.parse_args([])
+        reloader = argparse_config.Reloader(parser, cli_args, [])
+        calls = []
+
+        def callback(namespace: argparse.Namespace) -> None:
+            calls.append(namespace.workers)
+            raise RuntimeError("callback failed")
+
+        reloader.on_change(["workers"], callback)
+        dotenv.write_text("TEST_WORKERS=abc\n")
+        with pytest.raises(ValueError):
+            reloader.poll()
+        dotenv.write_text("TEST_WORKERS=3\nTEST_MODE=other\n")
+        with pytest.raises(ValueError):
+            reloader.poll()
+        assert (cli_args.workers, cli_args.mode) == (2, "fast")
+
+        # A raising callback does not stop the update.
+        dotenv.write_text("TEST_WORKERS=4\n")
+        assert reloader.poll() == ["workers"]
+        assert cli_args.workers == 4 and calls == [4]
+
+        # Nor does a bad value stop the polling thread.
+        dotenv.write_text("TEST_WORKERS=abcd\n")
+        reloader.start(interval=0.01)
+        time.sleep(0.05)
+        dotenv.write_text("TEST_WORKERS=5\n")
+        for _ in range(100):
+            if cli_args.workers == 5:
+                break
+            time.sleep(0.01)
+        reloader.stop()
+        assert cli_args.workers == 5
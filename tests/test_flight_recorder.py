@@ -0,0 +1,66 @@
+import json
+import logging
+import sys
+import tempfile
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+from plexiglass import argparse_config, flight_recorder, workspace, workspace_config
+
+LOGGER = SimpleNamespace(name="test_flight_recorder")
+
+
+def test_ring_buffer() -> None:
+    recorder = flight_recorder.FlightRecorder(level=logging.INFO, size=3)
+    for i in range(5):
+        event = {"event": "step", "index": i}
+        assert recorder(LOGGER, "info", event) is event
+    recorder(LOGGER, "debug", {"event": "too fine"})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        recorder(LOGGER, "exception", {"event": "failed", "exc_info": True})
+
+    lines = [json.loads(line) for line in recorder.render().decode().splitlines()]
+    assert [line.get("index") for line in lines] == [3, 4, None]
+    assert lines[0]["level"] == "info" and lines[0]["logger"] == "test_flight_recorder"
+    assert lines[-1]["level"] == "error" and "ValueError: boom" in lines[-1]["exc_info"]
+
+
+def test_dump(monkeypatch: Any) -> None:
+    # Starting the recorder hooks the process, which is undone after the test.
+    monkeypatch.setattr(sys, "excepthook", sys.excepthook)
+    if hasattr(threading, "excepthook"):
+        monkeypatch.setattr(threading, "excepthook", threading.excepthook)
+    monkeypatch.setattr(flight_recorder, "_HOOKED", flight_recorder._HOOKED)
+    monkeypatch.setattr(flight_recorder, "_ORIGINAL_HOOKS", list(flight_recorder._ORIGINAL_HOOKS))
+    monkeypatch.setattr(workspace, "_ERROR_FLAG_CALLBACKS", list(workspace._ERROR_FLAG_CALLBACKS))
+
+    parser = argparse_config.make_parser()
+    workspace_config.configure_parser(parser)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cli_args = parser.parse_args(["--workspace-dir", tmpdir])
+        workspace_config.configure_workspace(cli_args)
+
+        recorder = flight_recorder.start(level=logging.DEBUG, size=10)
+        recorder(LOGGER, "debug", {"event": "context"})
+        try:
+            # Dumped when the error flag is set.
+            workspace.set_error_flag(cli_args)
+            dumps = list(cli_args.workspace_dirs.debug.glob("flight-recorder-*.jsonl"))
+            assert len(dumps) == 1
+            assert json.loads(dumps[0].read_text())["event"] == "context"
+
+            # And on unhandled exceptions, before the original hook runs.
+            recorder.cli_args = cli_args
+            original, flight_recorder._ORIGINAL_HOOKS[0] = flight_recorder._ORIGINAL_HOOKS[0], lambda *args: None
+            try:
+                sys.excepthook(ValueError, ValueError("boom"), None)
+            finally:
+                flight_recorder._ORIGINAL_HOOKS[0] = original
+            # Every dump gets its own file, even within the same second.
+            assert len(list(cli_args.workspace_dirs.debug.glob("flight-recorder-*.jsonl"))) == 2
+        finally:
+            flight_recorder.stop()
@@ -1,9 +1,12 @@
 from collections import Counter, defaultdict
+import io
 import json
+import sys
 
 import pytest
 
-from plexiglass.jot import Jot
+from plexiglass import jot
+from plexiglass.jot import FrozenJot, Jot, unpack
 
 
 def test_jot_basic():
@@ -190,3 +193,281 @@ def test_jot_dict_subclass():
     a.c = defaultdict(list)
     assert type(a.b) == Counter
     assert type(a.c) == defaultdict
+
+
+def test_jot_copy_on_write():
+    """
+    Copy-on-write Jots share untouched subtrees with their base and copy
+    nodes as they are read or written.
+    """
+    a = Jot({"test": Jot({"inner": [Jot({"a": 10})]}), "x": {"y": 1, "z": [1]}, "k": 5})
+    b = a({"x": {"y": 2}, "new": 1}, cow=True)
+    assert str(b) == json.dumps({"test": {"inner": [{"a": 10}]}, "x": {"y": 2, "z": [1]}, "k": 5, "new": 1})
+
+    # Writes through the derived Jot never reach the base.
+    b.test.inner[0].a = 20
+    b.x.z.append(3)
+    assert a.test.inner[0].a == 10
+    assert a.x.z == [1]
+    assert a.x.y == 1
+
+    # Dict methods, deletion and containment see the keys from the base.
+    c = a(cow=True)
+    assert "k" in c
+    assert c["k"] == 5
+    assert list(c.keys()) == ["test", "x", "k"]
+    del c.k
+    assert "k" not in c
+    assert "k" in a
+
+    # Overlays can be stacked.
+    d = b({"x": {"w": 1}}, cow=True)
+    assert str(d.x) == json.dumps({"y": 2, "z": [1, 3], "w": 1})
+    assert "w" not in b.x
+
+
+def test_jot_copy_on_write_shares():
+    """
+    Only the nodes along the overlay are copied.
+    """
+    a = Jot({"left": {"deep": {"value": 1}}, "right": {"deep": {"value": 2}}})
+    b = a({"left": {"deep": {"value": 3}}}, cow=True)
+    # The untouched sibling is a copy-on-write node over the original.
+    assert b.__dict__["right"]._base_ is a.right
+    assert not b.__dict__["right"].__dict__
+    assert b.left.deep.value == 3
+    assert a.left.deep.value == 1
+
+
+def test_jot_merge_deep():
+    """
+    Merging does not recurse, so documents deeper than the recursion limit load.
+    """
+    document = {}
+    node = document
+    for i in range(sys.getrecursionlimit() * 2):
+        node["next"] = {"value": i, "items": [[i]]}
+        node = node["next"]
+
+    j = Jot(document)
+    for i in range(sys.getrecursionlimit() * 2):
+        j = j.next
+        assert isinstance(j, Jot)
+        assert j.value == i
+        assert j.items == [[i]]
+
+
+def test_jot_merge_lists():
+    hashes = ["a", "b"]
+    j = Jot({"hashes": hashes, "nested": {"tags": [{"x": 1}]}})
+    assert j.hashes is not hashes
+
+    j.merge({"hashes": hashes}, lists="reference")
+    assert j.hashes is hashes
+
+    j = Jot({"hashes": ["a", "b"], "nested": {"tags": [{"x": 1}]}})
+    j.merge({"hashes": ["b", "c"], "nested": {"tags": [{"x": 1}, {"y": 2}]}}, lists="union")
+    assert j.hashes == ["a", "b", "c"]
+    assert j.nested.tags == [{"x": 1}, {"y": 2}]
+
+    j.merge({"hashes": ["a"], "nested": {"tags": [{"x": 1}]}, "new": [1]}, lists={"nested.tags": "append"})
+    assert j.hashes == ["a"]
+    assert j.nested.tags == [{"x": 1}, {"y": 2}, {"x": 1}]
+    assert j.new == [1]
+
+    j.merge({"hashes": [1, 2]}, lists=lambda current, value: current + value)
+    assert j.hashes == ["a", 1, 2]
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_jot_dump(fast, monkeypatch):
+    """
+    Jots serialize to compact JSON without building an unpacked copy first,
+    with or without orjson installed.
+    """
+    if not fast:
+        monkeypatch.setattr(jot, "_orjson", None)
+    a = Jot({"a": 1, "b": {"c": [1, Jot({"d": "é"})]}, "e": (1, 2)})
+    expected = json.dumps(unpack(a), ensure_ascii=False, separators=(",", ":"))
+
+    assert jot.dumps(a) == expected
+    assert "".join(jot.iterencode(a)) == expected
+    assert repr(a) == json.dumps(unpack(a))
+
+    text = io.StringIO()
+    jot.dump(a, text)
+    assert text.getvalue() == expected
+
+    binary = io.BytesIO()
+    jot.dump(a, binary)
+    assert binary.getvalue().decode() == expected
+
+    with pytest.raises(TypeError):
+        jot.dumps(Jot({"a": object()}))
+
+
+def test_jot_load():
+    """
+    Lazily loaded Jots only build nested Jots for the keys that are read.
+    """
+    document = {"a": {"b": {"c": 1}, "d": [{"e": 2}]}, "f": {"g": 3}, "h": 4}
+    a = jot.loads(json.dumps(document))
+    assert not a.__dict__
+    assert a.a.b.c == 1
+    assert list(a.__dict__) == ["a"]
+    assert isinstance(a.f, Jot)
+    assert a.h == 4
+    assert str(a) == str(Jot(document))
+
+    # Writes stay in the Jot and the view of the document.
+    a.a.b.c = 5
+    a.f.clear()
+    assert str(a) == json.dumps({"a": {"b": {"c": 5}, "d": [{"e": 2}]}, "f": {}, "h": 4})
+
+    # Lazily loaded Jots merge like any other.
+    b = Jot({"f": {"i": 6}}, auto=False)
+    b.merge(jot.load(io.StringIO(json.dumps(document)), auto=True))
+    assert isinstance(b.a.b, Jot)
+    assert b.f == {"i": 6, "g": 3}
+
+    with pytest.raises(ValueError):
+        jot.loads("[1, 2]")
+
+
+def test_jot_load_lines():
+    lines = io.StringIO('{"a": 1}\n\n{"a": {"b": 2}}\n')
+    result = jot.load_lines(lines, auto=False)
+    assert next(result).a == 1
+    assert next(result).a == {"b": 2}
+    with pytest.raises(StopIteration):
+        next(result)
+
+
+def test_jot_parsers():
+    """
+    Jots built from strings parse as json.loads does, only the load functions
+    use orjson when it is installed.
+    """
+    text = '{"a": 123456789012345678901234567890, "b": NaN}'
+    a = Jot(text)
+    assert a.a == 123456789012345678901234567890
+    assert a.b != a.b
+    assert FrozenJot(text).a == 123456789012345678901234567890
+
+    if jot._fast_json() is not None:
+        assert isinstance(jot.loads('{"a": 123456789012345678901234567890}').a, float)
+        with pytest.raises(ValueError):
+            jot.loads(text)
+        assert jot.dumps(Jot({"b": float("nan")})) == '{"b":null}'
+    assert repr(Jot({"b": float("nan")})) == '{"b": NaN}'
+
+
+def test_frozen_jot():
+    """
+    FrozenJots reject mutation, never create keys and are hashable.
+    """
+    a = Jot({"a": {"b": [1, {"c": 2}]}, "d": 3})
+    f = FrozenJot(a)
+    assert str(f) == str(a)
+    assert isinstance(f.a, FrozenJot)
+    assert f.a.b == (1, FrozenJot({"c": 2}))
+    assert f == FrozenJot(str(a))
+    assert {f: True}[FrozenJot(a)]
+    assert list(f.keys()) == ["a", "d"]
+    assert f.get("missing", 1) == 1
+
+    for mutate in (
+        lambda: setattr(f, "x", 1),
+        lambda: f.__setitem__("x", 1),
+        lambda: delattr(f, "d"),
+        lambda: f.a.pop("b"),
+        lambda: f.merge({"x": 1}),
+    ):
+        with pytest.raises(TypeError):
+            mutate()
+    with pytest.raises(AttributeError):
+        f.missing
+    with pytest.raises(KeyError):
+        f["missing"]
+    assert "missing" not in f
+    assert str(f) == str(a)
+
+    with pytest.raises(TypeError):
+        FrozenJot({"a": bytearray()})
+
+
+def test_frozen_jot_derive():
+    """
+    Jots derived from a FrozenJot are mutable and freezing them again reuses
+    any subtree that was not touched.
+    """
+    f = FrozenJot({"a": {"b": 1}, "c": {"d": 2}})
+    g = f({"c": {"e": 3}}, cow=True)
+    g.c.d = 4
+    assert isinstance(g.c, Jot) and not isinstance(g.c, FrozenJot)
+    assert f.c.d == 2
+
+    h = FrozenJot(g)
+    assert h.a is f.a
+    assert h.c == FrozenJot({"d": 4, "e": 3})
+    assert str(f({"a": {"x": 1}})) == json.dumps({"a": {"b": 1, "x": 1}, "c": {"d": 2}})
+
+
+def test_jot_get_path():
+    """
+    Paths are looked up without creating missing nodes.
+    """
+    a = Jot({"services": {"redis": {"host": "localhost", "ports": [6379, {"tls": 6380}]}}, "a.b": 1})
+    assert a.get_path("services.redis.host") == "localhost"
+    assert a.get_path("services.redis.ports.0") == 6379
+    assert a.get_path("services.redis.ports.-1.tls") == 6380
+    assert a.get_path(("a.b",)) == 1
+    assert a.get_path("services.redis.missing.deeper", 10) == 10
+    assert a.get_path("services.redis.ports.5") is None
+    assert a.get_path("services.redis.host.0") is None
+    assert "missing" not in a.services.redis
+
+    assert a.get_paths(["services.redis.host", "services.nats.host"], "") == ["localhost", ""]
+    assert "nats" not in a.services
+
+    # Copy-on-write and lazily loaded Jots are read through.
+    b = a(cow=True)
+    assert b.get_path("services.redis.ports.1.tls") == 6380
+    c = jot.loads(str(a))
+    assert c.get_path("services.redis.host") == "localhost"
+    assert FrozenJot(a).get_path("services.redis.ports.1.tls") == 6380
+
+
+def test_jot_diff_patch():
+    """
+    Changes from diff can be serialized and patched into another copy.
+    """
+    a = Jot({"a": {"b": 1, "c": [1]}, "d": 2, "e": {"f": {"g": 1}}})
+    b = a({"a": {"b": 2, "c": [1], "x": {"y": 1}}, "n": 5}, cow=True)
+    del b.d
+
+    changes = jot.diff(a, b)
+    assert changes.added == [[["n"], 5], [["a", "x"], b.a.x]]
+    assert changes.removed == [["d"]]
+    assert changes.changed == [[["a", "b"], 2]]
+
+    c = Jot(a)
+    assert jot.patch(c, Jot(str(changes))) is c
+    assert str(c) == str(b)
+    assert not jot.diff(c, b).added and not jot.diff(c, b).changed
+
+    # Type changes are replaced as a whole.
+    assert jot.diff(Jot({"a": 1}), Jot({"a": "1"})).changed == [[["a"], "1"]]
+    assert jot.diff(Jot({"a": {"b": 1}}), Jot({"a": 1})).changed == [[["a"], 1]]
+
+
+def test_jot_diff_shared():
+    """
+    Subtrees shared through copy-on-write are not walked.
+    """
+    base = FrozenJot({"big": {str(i): {"value": i} for i in range(100)}, "small": {"value": 1}})
+    derived = base({"small": {"value": 2}}, cow=True)
+    changes = jot.diff(base, derived)
+    assert changes.changed == [[["small", "value"], 2]]
+    # Untouched subtrees are never pulled down from the base.
+    assert not derived.__dict__["big"].__dict__
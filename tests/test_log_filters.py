@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+import pytest
+from structlog import DropEvent
+
+from plexiglass import log_filters
+
+LOGGER = SimpleNamespace(name="test_log_filters")
+
+
+def run(processor: Callable[..., Dict[str, Any]], events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    kept = []
+    for event in events:
+        try:
+            kept.append(processor(LOGGER, "error", dict(event)))
+        except DropEvent:
+            pass
+    return kept
+
+
+def test_parse_rates() -> None:
+    assert log_filters.parse_rates("") == {}
+    assert log_filters.parse_rates("debug=0.01, INFO=1") == {"debug": 0.01, "info": 1.0}
+    with pytest.raises(ValueError):
+        log_filters.parse_rates("debug")
+
+
+def test_sampler(monkeypatch: Any) -> None:
+    draws = iter([0.5, 0.05, 0.2])
+    monkeypatch.setattr(log_filters.random, "random", lambda: next(draws))
+    sampler = log_filters.Sampler({"debug": 0.1, "info": 1})
+
+    kept = run(sampler, [{"event": "a", "level": "debug"}] * 3 + [{"event": "b", "level": "info"}])
+    assert kept == [{"event": "a", "level": "debug", "sample_rate": 0.1}, {"event": "b", "level": "info"}]
+
+
+def test_rate_limiter(monkeypatch: Any) -> None:
+    now = [0.0]
+    monkeypatch.setattr(log_filters.time, "monotonic", lambda: now[0])
+    limiter = log_filters.RateLimiter(rate=1, burst=2)
+
+    assert len(run(limiter, [{"event": "down", "level": "error"}] * 5)) == 2
+    # Other events have their own bucket.
+    assert len(run(limiter, [{"event": "other", "level": "error"}])) == 1
+    now[0] = 1.0
+    assert run(limiter, [{"event": "down", "level": "error"}] * 2) == [
+        {"event": "down", "level": "error", "suppressed": 3}
+    ]
+
+
+def test_deduplicator(monkeypatch: Any) -> None:
+    now = [0.0]
+    monkeypatch.setattr(log_filters.time, "monotonic", lambda: now[0])
+    dedup = log_filters.Deduplicator(window=5)
+
+    events = [{"event": "down", "host": "a"}, {"host": "a", "event": "down"}, {"event": "down", "host": "b"}]
+    assert run(dedup, events * 10) == [events[0], events[2]]
+    now[0] = 5.0
+    assert run(dedup, events[:1]) == [dict(events[0], suppressed=19)]
@@ -0,0 +1,94 @@
+import logging
+import queue
+import threading
+import time
+from typing import List
+
+import pytest
+
+from plexiglass import log_queue
+
+
+class Collect(logging.Handler):
+    """Collect messages, holding up the first one until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: List[str] = []
+        self.threads: List[str] = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.entered.set()
+        self.gate.wait()
+        self.messages.append(self.format(record))
+        self.threads.append(threading.current_thread().name)
+
+
+def make_record(i: int) -> logging.LogRecord:
+    return logging.makeLogRecord({"msg": "record %d", "args": (i,)})
+
+
+@pytest.mark.parametrize("overflow, expected", [("drop-newest", [0, 1, 2]), ("drop-oldest", [7, 8, 9])])
+def test_overflow(overflow: str, expected: List[int]) -> None:
+    handler = log_queue.BoundedQueueHandler(queue.Queue(3), overflow)
+    for i in range(10):
+        handler.handle(make_record(i))
+    assert handler.dropped == 7
+    assert [handler.queue.get_nowait().getMessage() for _ in range(3)] == [f"record {i}" for i in expected]
+
+    with pytest.raises(ValueError):
+        log_queue.BoundedQueueHandler(queue.Queue(3), "explode")
+
+
+def test_prepare() -> None:
+    """Arguments are merged into the message as they were when logged."""
+    handler = log_queue.BoundedQueueHandler(queue.Queue(3))
+    values = [1]
+    handler.handle(logging.makeLogRecord({"msg": "values %s", "args": (values,)}))
+    values.append(2)
+    record = handler.queue.get_nowait()
+    assert record.msg == "values [1]" and not record.args
+
+
+def test_sentinel_kept() -> None:
+    """Dropping the oldest record never drops the listener's stop sentinel."""
+    handler = log_queue.BoundedQueueHandler(queue.Queue(1), "drop-oldest")
+    handler.queue.put_nowait(log_queue._SENTINEL)
+    handler.handle(make_record(0))
+    assert handler.dropped == 1
+    assert handler.queue.get_nowait() is log_queue._SENTINEL
+
+
+def test_start_stop() -> None:
+    logger = logging.getLogger("test_log_queue")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    collect = Collect()
+    logger.addHandler(collect)
+
+    handler = log_queue.start(logger, size=2, overflow="drop-newest")
+    assert logger.handlers == [handler]
+    logger.warning("first")
+    # Fill the queue while the listener is busy writing the first record.
+    assert collect.entered.wait(5)
+    for message in ("second", "third", "dropped"):
+        logger.warning(message)
+
+    # The original handlers are back before stop waits to queue its sentinel.
+    stopping = threading.Thread(target=log_queue.stop)
+    stopping.start()
+    for _ in range(500):
+        if logger.handlers == [collect]:
+            break
+        time.sleep(0.01)
+    assert logger.handlers == [collect]
+    collect.gate.set()
+    stopping.join(5)
+    assert not stopping.is_alive()
+
+    assert collect.messages == ["first", "second", "third", "dropped 1 log records from a full log queue"]
+    assert collect.threads[0] != threading.current_thread().name
+    # Stopping twice is harmless.
+    log_queue.stop()
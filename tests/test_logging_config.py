@@ -1,9 +1,13 @@
 import json
-from typing import Any
+import logging as stdlib_logging
+import sys
+import tempfile
+import threading
+from typing import Any, List
 
 import structlog as logging
 
-from plexiglass import argparse_config, logging_config
+from plexiglass import argparse_config, flight_recorder, log_queue, logging_config, workspace, workspace_config
 
 
 def test_verbosity() -> None:
@@ -34,3 +38,142 @@ def test_jsonl(capsys: Any) -> None:
     assert line
     assert "event" in line
     assert line["event"] == "Hello!"
+
+
+def test_log_queue(capsys: Any) -> None:
+    parser = argparse_config.make_parser()
+    logging_config.configure_parser(parser)
+
+    cli_args = parser.parse_args(["--jsonl", "--log-queue", "--log-queue-overflow", "drop-oldest"])
+    logging_config.configure_logging(cli_args)
+    logging.getLogger(__name__).warning("Queued!")
+
+    # Records are written once the queue is flushed.
+    log_queue.stop()
+    line = json.loads(capsys.readouterr().err)
+    assert line["event"] == "Queued!"
+
+
+def test_jsonl_fast_path(capsys: Any) -> None:
+    parser = argparse_config.make_parser()
+    logging_config.configure_parser(parser)
+
+    # A logger cached under one configuration follows later reconfiguration.
+    log = logging.getLogger(__name__)
+    logging_config.configure_logging(parser.parse_args([]))
+    log.debug("Dropped")
+    logging_config.configure_logging(parser.parse_args(["-v", "--jsonl"]))
+    log.info("Hello!", count=1, ratio=0.5, tags=["a"], mapping={1: "one"})
+    log.debug("Filtered")
+
+    lines = capsys.readouterr().err.splitlines()
+    assert len(lines) == 1
+    line = json.loads(lines[0])
+    assert line["event"] == "Hello!"
+    assert line["count"] == 1 and line["ratio"] == 0.5 and line["tags"] == ["a"] and line["mapping"] == {"1": "one"}
+    assert line["level"] == "info"
+    # The same format as structlog's own ISO timestamps.
+    assert line["timestamp"].endswith("Z") and len(line["timestamp"]) == len("2000-01-01T00:00:00.000000Z")
+
+
+def test_logger_names() -> None:
+    """
+    Loggers are named after the calling module and report the calling function.
+    """
+    parser = argparse_config.make_parser()
+    logging_config.configure_parser(parser)
+    logging_config.configure_logging(parser.parse_args([]))
+
+    records: List[stdlib_logging.LogRecord] = []
+
+    class Collect(stdlib_logging.Handler):
+        def emit(self, record: stdlib_logging.LogRecord) -> None:
+            records.append(record)
+
+    handler = Collect()
+    stdlib_logging.getLogger(__name__).addHandler(handler)
+    try:
+        logging.get_logger().warning("Named")
+    finally:
+        stdlib_logging.getLogger(__name__).removeHandler(handler)
+    assert [(record.name, record.funcName) for record in records] == [(__name__, "test_logger_names")]
+
+
+def test_disabled_levels(capsys: Any) -> None:
+    parser = argparse_config.make_parser()
+    logging_config.configure_parser(parser)
+    log = logging.getLogger(__name__).bind(request=1)
+
+    logging_config.configure_logging(parser.parse_args(["--jsonl", "--log-level", "ERROR"]))
+    # Disabled levels never reach the processors.
+    log.info("Dropped")
+    assert type(log).warning is logging_config._nop
+    log.error("Kept")
+
+    # The cached logger follows the new level.
+    logging_config.configure_logging(parser.parse_args(["--jsonl", "-vv"]))
+    log.debug("Debugging")
+
+    # Loggers set below the configured level still log from their own level.
+    logging_config.configure_logging(parser.parse_args(["--jsonl", "--log-level", "INFO"]))
+    stdlib_logging.getLogger("t4mod").setLevel(stdlib_logging.DEBUG)
+    try:
+        logging.get_logger("t4mod").debug("Child")
+        logging.get_logger("t4other").debug("Dropped")
+    finally:
+        stdlib_logging.getLogger("t4mod").setLevel(stdlib_logging.NOTSET)
+
+    events = [json.loads(line)["event"] for line in capsys.readouterr().err.splitlines()]
+    assert events == ["Kept", "Debugging", "Child"]
+
+
+def test_flow_control(capsys: Any) -> None:
+    parser = argparse_config.make_parser()
+    logging_config.configure_parser(parser)
+
+    cli_args = parser.parse_args(["--jsonl", "--log-rate-limit", "0.001", "--log-rate-burst", "2"])
+    logging_config.configure_logging(cli_args)
+    log = logging.getLogger(__name__)
+    for _ in range(100):
+        log.error("Upstream down")
+    log.error("Something else")
+
+    events = [json.loads(line)["event"] for line in capsys.readouterr().err.splitlines()]
+    assert events == ["Upstream down", "Upstream down", "Something else"]
+
+    # Flow control is off by default.
+    logging_config.configure_logging(parser.parse_args(["--jsonl"]))
+    for _ in range(3):
+        log.error("Upstream down")
+    assert len(capsys.readouterr().err.splitlines()) == 3
+
+
+def test_flight_recorder(capsys: Any, monkeypatch: Any) -> None:
+    # Starting the recorder hooks the process, which is undone after the test.
+    monkeypatch.setattr(sys, "excepthook", sys.excepthook)
+    if hasattr(threading, "excepthook"):
+        monkeypatch.setattr(threading, "excepthook", threading.excepthook)
+    monkeypatch.setattr(flight_recorder, "_HOOKED", flight_recorder._HOOKED)
+    monkeypatch.setattr(flight_recorder, "_ORIGINAL_HOOKS", list(flight_recorder._ORIGINAL_HOOKS))
+    monkeypatch.setattr(workspace, "_ERROR_FLAG_CALLBACKS", list(workspace._ERROR_FLAG_CALLBACKS))
+
+    parser = argparse_config.make_parser()
+    logging_config.configure_parser(parser)
+    workspace_config.configure_parser(parser)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cli_args = parser.parse_args(["--workspace-dir", tmpdir, "--jsonl", "--log-record-level", "DEBUG"])
+        workspace_config.configure_workspace(cli_args)
+        logging_config.configure_logging(cli_args)
+        log = logging.getLogger(__name__)
+        log.debug("Context", step=1)
+        log.error("Failed")
+        workspace.set_error_flag(cli_args)
+
+        # Only the error is written out, but the dump has both events.
+        assert [json.loads(line)["event"] for line in capsys.readouterr().err.splitlines()] == ["Failed"]
+        (dump,) = cli_args.workspace_dirs.debug.glob("flight-recorder-*.jsonl")
+        assert [json.loads(line)["event"] for line in dump.read_text().splitlines()] == ["Context", "Failed"]
+
+    logging_config.configure_logging(parser.parse_args(["--workspace-dir", tmpdir]))
+    assert flight_recorder._RECORDER is None
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from plexiglass.jot import dumps, Jot
+from plexiglass.record import make_record
+
+
+def test_record() -> None:
+    Sample = make_record("Sample", Jot({"sha256": "", "size": 0, "meta": {}}))
+    assert Sample is make_record("Sample", ["sha256", "size", "meta"])
+
+    sample = Sample({"sha256": "abc", "meta": {"source": "feed"}}, size=10)
+    assert not hasattr(sample, "__dict__")
+    assert sample.sha256 == "abc"
+    assert sample["size"] == 10
+    assert isinstance(sample.meta, Jot)
+    assert "size" in sample and "missing" not in sample
+
+    sample["size"] += 1
+    sample.merge({"meta": {"tags": ["a"]}})
+    assert str(sample) == json.dumps({"sha256": "abc", "size": 11, "meta": {"source": "feed", "tags": ["a"]}})
+    expected = {"samples": [json.loads(str(sample))]}
+    assert dumps(Jot({"samples": [sample]})) == json.dumps(expected, separators=(",", ":"))
+
+    # Unset fields default to None.
+    assert Sample().size is None
+
+    # JSON strings parse as they do for a Jot, and values are copied once.
+    tags = ["a"]
+    sample = Sample('{"size": 123456789012345678901234567890}', sha256=tags)
+    assert sample.size == Jot('{"size": 123456789012345678901234567890}').size
+    assert sample.sha256 == tags and sample.sha256 is not tags
+
+
+def test_record_fields() -> None:
+    Sample = make_record("Sample", ["size"])
+    with pytest.raises(AttributeError):
+        Sample({"missing": 1})
+    with pytest.raises(AttributeError):
+        Sample().missing = 1
+    with pytest.raises(KeyError):
+        Sample()["missing"]
+    with pytest.raises(ValueError):
+        make_record("Invalid", ["nest-ed"])
+    with pytest.raises(ValueError):
+        make_record("Invalid", ["merge"])
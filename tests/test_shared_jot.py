@@ -0,0 +1,38 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import pickle
+from typing import Tuple
+
+from plexiglass.jot import FrozenJot, Jot
+from plexiglass.shared_jot import SharedJot
+
+
+def read(config: SharedJot, key: str) -> Tuple[int, int, int]:
+    jot = config.get()
+    # The same Jot is reused for every task run by a worker.
+    return os.getpid(), id(jot), jot.values[key]
+
+
+def test_pickle() -> None:
+    a = Jot({"a": {"b": [1, Jot({"c": 2})]}}, auto=False)
+    b = pickle.loads(pickle.dumps(a))
+    assert str(a) == str(b)
+    assert b._auto_ is False
+    assert isinstance(b.a["b"][1], Jot)
+
+    f = FrozenJot(a)
+    assert pickle.loads(pickle.dumps(f)) == f
+
+
+def test_shared_jot() -> None:
+    data = {"values": {str(i): i for i in range(1000)}}
+    with SharedJot(data) as config:
+        assert len(pickle.dumps(config)) < 100
+        assert config.get().values["10"] == 10
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(read, [config] * 20, [str(i) for i in range(20)]))
+
+    assert [value for _, _, value in results] == list(range(20))
+    # Each worker loaded the Jot at most once.
+    assert len({(pid, jot_id) for pid, jot_id, _ in results}) <= 2
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from plexiglass.jot import FrozenJot
+from plexiglass.snapshot import VersionedJot
+
+
+def test_versions() -> None:
+    config = VersionedJot({"redis": {"host": "127.0.0.1", "port": 6379}, "nats": {"host": "127.0.0.1"}})
+    version, first = config.current()
+    assert version == 0
+    assert isinstance(first, FrozenJot)
+
+    with config.edit() as draft:
+        draft.redis.host = "10.0.0.1"
+    assert config.version == 1
+    assert config.snapshot.redis.host == "10.0.0.1"
+    # Previous snapshots are unchanged and untouched subtrees are shared.
+    assert first.redis.host == "127.0.0.1"
+    assert config.snapshot.nats is first.nats
+
+    assert config.update({"redis": {"port": 6380}}) == 2
+    assert config.snapshot.redis.port == 6380
+    assert config.publish({"fresh": True}) == 3
+    assert "redis" not in config.snapshot
+
+
+def test_failed_edit() -> None:
+    config = VersionedJot({"a": 1})
+    with pytest.raises(ValueError):
+        with config.edit() as draft:
+            draft.a = 2
+            raise ValueError()
+    assert config.version == 0
+    assert config.snapshot.a == 1
+
+
+def test_concurrent_readers() -> None:
+    """
+    Readers always see a version number that matches its snapshot.
+    """
+    config = VersionedJot({"version": 0})
+    mismatches = []
+    done = threading.Event()
+
+    def read() -> None:
+        while not done.is_set():
+            version, snapshot = config.current()
+            if snapshot.version != version:
+                mismatches.append(version)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for version in range(1, 500):
+        with config.edit() as draft:
+            draft.version = version
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert not mismatches
+    assert config.version == 499
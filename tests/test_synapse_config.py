@@ -0,0 +1,52 @@
+import argparse
+from contextlib import contextmanager
+import sys
+import time
+import types
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
+
+import pytest
+
+from plexiglass import synapse_config
+from plexiglass.time import Budget, DeadlineExceeded
+
+
+def test_syn_context(monkeypatch: Any) -> None:
+    """
+    Connections are given what is left of the budget as their timeout.
+    """
+    opened: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def openurl(url: str, **opts: Any) -> Iterator[str]:
+        opened.append({"url": url, **opts})
+        yield f"proxy:{url}"
+
+    telepath = types.ModuleType("synapse.telepath")
+    setattr(telepath, "openurl", openurl)
+    monkeypatch.setitem(sys.modules, "synapse", types.ModuleType("synapse"))
+    monkeypatch.setitem(sys.modules, "synapse.telepath", telepath)
+
+    @synapse_config.with_cortex
+    def query(cli_args: argparse.Namespace, cortex: str) -> str:
+        return cortex
+
+    cli_args = argparse.Namespace(cortex_url="tcp://cortex")
+    assert query(cli_args) == "proxy:tcp://cortex"
+    assert opened.pop() == {"url": "tcp://cortex"}
+
+    with Budget(10):
+        assert query(cli_args) == "proxy:tcp://cortex"
+        assert 0 < opened.pop()["timeout"] <= 10
+
+    # Nothing is opened once the budget is used up, even when it runs out
+    # between checking it and reading what is left.
+    with Budget(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            query(cli_args)
+        with patch.object(synapse_config, "bounded_timeout", return_value=0.0):
+            with pytest.raises(DeadlineExceeded):
+                query(cli_args)
+    assert opened == []
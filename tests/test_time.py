@@ -1,6 +1,33 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+import json
+import os
+import pstats
+import tempfile
+import threading
 import time
+import tracemalloc
+from typing import Any, List, Optional
 
-from plexiglass.time import timestamp, timer
+import pytest
+
+from plexiglass import argparse_config, logging_config, profiling_config, workspace_config
+from plexiglass import time as plexiglass_time
+from plexiglass.jot import Jot
+from plexiglass.time import (
+    bounded_timeout,
+    Budget,
+    budget_remaining,
+    check_budget,
+    Deadline,
+    DeadlineExceeded,
+    profile,
+    snapshot,
+    timestamp,
+    timer,
+    TimerEmitter,
+)
 
 
 def test_basic() -> None:
@@ -13,3 +40,260 @@ def test_basic() -> None:
     assert len(elapsed) > 0
     assert isinstance(elapsed[0], float)
     assert elapsed[0] > 0.0
+
+
+def test_histogram() -> None:
+    histogram = plexiglass_time.Histogram()
+    values = [i / 1000 for i in range(1, 1001)] + [0.0, 1e6]
+    for value in values:
+        histogram.record(value)
+
+    stats = histogram.snapshot(reset=True)
+    assert stats["count"] == 1002 and stats["min"] == 0.0 and stats["max"] == 1e6
+    assert abs(stats["sum"] - sum(values)) < 1e-6
+    for key, expected in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        assert abs(stats[key] - expected) / expected < 0.03
+    assert histogram.snapshot()["count"] == 0
+
+
+def test_named_timers() -> None:
+    plexiglass_time.reset()
+
+    @timer("test.decorated")
+    def work() -> None:
+        time.sleep(0.001)
+
+    def run() -> None:
+        for _ in range(1000):
+            with timer("test.threads"):
+                pass
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    work()
+    work()
+    assert work.__name__ == "work"
+    # Timers are slotted.
+    assert not hasattr(timer("test.threads"), "__dict__")
+
+    stats = snapshot(reset=True)
+    assert isinstance(stats, Jot)
+    assert stats["test.threads"].count == 4000
+    assert stats["test.decorated"].count == 2 and stats["test.decorated"].min >= 0.001
+    assert "test.decorated" not in snapshot()
+
+
+def test_emitter(capsys: Any) -> None:
+    parser = argparse_config.make_parser()
+    logging_config.configure_parser(parser)
+    logging_config.configure_logging(parser.parse_args(["--jsonl", "-v"]))
+    plexiglass_time.reset()
+
+    emitter = TimerEmitter()
+    emitter.start(interval=60)
+    with timer("test.emitted"):
+        pass
+    # Whatever was recorded is emitted when the emitter stops.
+    emitter.stop()
+
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert [(line["event"], line["timer"], line["count"]) for line in lines] == [("timer", "test.emitted", 1)]
+    assert str(snapshot()) == "{}"
+
+
+def spin() -> None:
+    while True:
+        pass
+
+
+def test_deadline() -> None:
+    with pytest.raises(DeadlineExceeded):
+        with Deadline(0.05) as deadline:
+            assert 0 < deadline.remaining() <= 0.05
+            spin()
+    assert isinstance(DeadlineExceeded(), TimeoutError)
+
+    # Finishing in time leaves nothing to be raised later.
+    with Deadline(0.05):
+        pass
+    time.sleep(0.1)
+
+    with pytest.raises(ValueError):
+        Deadline(0)
+    with Deadline(None):
+        pass
+
+
+def test_deadline_nesting() -> None:
+    # An inner deadline that ends later than the outer one is not scheduled.
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        with Deadline(0.05):
+            with Deadline(10) as inner:
+                assert inner.remaining() <= 0.05
+                spin()
+    assert time.monotonic() - start < 5
+
+    with Deadline(10) as outer:
+        with pytest.raises(DeadlineExceeded):
+            with Deadline(0.05) as inner:
+                spin()
+    assert inner.expired and not outer.expired
+
+
+def test_deadline_threads() -> None:
+    def work(seconds: float) -> str:
+        try:
+            with Deadline(seconds):
+                spin()
+        except DeadlineExceeded:
+            return threading.current_thread().name
+        return ""
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        names = list(pool.map(work, [0.01 * i for i in range(1, 9)]))
+    assert all(names) and len(set(names)) > 1
+
+
+def test_deadline_asyncio() -> None:
+    async def main() -> None:
+        with pytest.raises(DeadlineExceeded):
+            async with Deadline(0.05):
+                await asyncio.sleep(10)
+        async with Deadline(1):
+            await asyncio.sleep(0)
+
+    asyncio.run(main())
+
+
+def test_deadline_closed_loop() -> None:
+    """A deadline whose event loop was closed does not stop the scheduler."""
+
+    async def abandon() -> None:
+        Deadline(0.01).__enter__()
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(abandon())
+    loop.close()
+    time.sleep(0.1)
+
+    with pytest.raises(DeadlineExceeded):
+        with Deadline(0.05):
+            end = time.monotonic() + 5
+            while time.monotonic() < end:
+                pass
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_deadline_fork() -> None:
+    """Forked children get a scheduler of their own."""
+    with Deadline(60):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                with pytest.raises(DeadlineExceeded):
+                    with Deadline(0.05):
+                        end = time.monotonic() + 5
+                        while time.monotonic() < end:
+                            pass
+                code = 0
+            finally:
+                os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+def test_deadline_scale() -> None:
+    deadlines = [Deadline(2000 - i / 20) for i in range(20000)]
+    with ExitStack() as stack:
+        for deadline in deadlines:
+            stack.enter_context(deadline)
+        assert len(plexiglass_time._SCHEDULER.heap) >= 20000
+    # Deadlines that ended are dropped from the heap.
+    assert len(plexiglass_time._SCHEDULER.heap) < 20000
+    assert not any(deadline.expired for deadline in deadlines)
+
+
+def test_budget() -> None:
+    assert budget_remaining() is None
+    assert bounded_timeout(5) == 5 and bounded_timeout() is None
+
+    with Budget(0.2) as outer:
+        assert bounded_timeout(10) <= 0.2
+        assert bounded_timeout(0.01) == 0.01
+        # A nested budget cannot extend the enclosing one.
+        with Budget(10):
+            assert budget_remaining() <= 0.2
+        with Deadline(10) as deadline:
+            assert deadline._token is None
+        time.sleep(0.2)
+        assert outer.remaining() == 0
+        # Fail fast instead of starting work that cannot finish.
+        with pytest.raises(DeadlineExceeded):
+            bounded_timeout(10)
+    check_budget()
+
+    # A budget that ends first does not keep a deadline from being enforced.
+    with Budget(0.05):
+        with pytest.raises(DeadlineExceeded):
+            with Deadline(0.2) as deadline:
+                assert deadline.remaining() <= 0.05
+                end = time.monotonic() + 5
+                while time.monotonic() < end:
+                    pass
+    assert deadline.expired
+
+    async def hop(seconds: float) -> Optional[float]:
+        await asyncio.sleep(seconds)
+        return budget_remaining()
+
+    async def main() -> None:
+        async with Budget(1):
+            # Tasks inherit the budget of the context that created them.
+            assert 0 < await asyncio.ensure_future(hop(0)) <= 1
+
+    asyncio.run(main())
+
+
+def test_profile(monkeypatch: Any) -> None:
+    parser = argparse_config.make_parser()
+    profiling_config.configure_parser(parser)
+    workspace_config.configure_parser(parser)
+
+    @profile("test")
+    def work() -> List[int]:
+        return [i * i for i in range(1000)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cli_args = parser.parse_args(["--workspace-dir", tmpdir])
+        workspace_config.configure_workspace(cli_args)
+        profiling_config.configure_profiling(cli_args)
+        work()
+        # Profiling is off by default.
+        assert not list(cli_args.workspace_dirs.debug.iterdir())
+
+        monkeypatch.setenv("PROFILE_RATE", "1")
+        cli_args = parser.parse_args(["--workspace-dir", tmpdir, "--profile-memory"])
+        workspace_config.configure_workspace(cli_args)
+        profiling_config.configure_profiling(cli_args)
+        try:
+            work()
+            with profile("block"):
+                work()
+        finally:
+            plexiglass_time.configure_profiling()
+
+        files = sorted(path.name for path in cli_args.workspace_dirs.debug.iterdir())
+        assert [(name.split("-")[1], os.path.splitext(name)[1]) for name in files] == [
+            ("block", ".prof"),
+            ("block", ".tracemalloc"),
+            ("test", ".prof"),
+            ("test", ".tracemalloc"),
+        ]
+        stats = pstats.Stats(str(cli_args.workspace_dirs.debug / files[2]))
+        assert any(function == "work" for _, _, function in stats.stats)
+        assert tracemalloc.Snapshot.load(str(cli_args.workspace_dirs.debug / files[3])).traces
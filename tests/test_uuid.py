@@ -1,7 +1,15 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
 from pathlib import Path
-from tempfile import NamedTemporaryFile
+import signal
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+import time
+import uuid
 
-from plexiglass.uuid import get_uuid
+import pytest
+
+from plexiglass import uuid as plexiglass_uuid
+from plexiglass.uuid import get_sortable_id, get_sortable_ids, get_uuid, sortable_id_time
 
 
 def test_basic_uuid() -> None:
@@ -38,3 +46,58 @@ def test_uuid_from_empty_file() -> None:
         value = get_uuid(path)
         assert len(path.read_text()) == 32
         assert value == path.read_text()
+
+
+def test_uuid_cached_and_shared() -> None:
+    with TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "uuid"
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            values = set(pool.map(get_uuid, [path] * 8))
+        # Every process agreed on the value written by the first one.
+        assert values == {path.read_text()}
+
+        # The value is read once per process.
+        value = get_uuid(path)
+        path.write_text("changed")
+        assert get_uuid(path) == value
+        # The file itself is locked, leaving nothing else behind.
+        assert os.listdir(tmpdir) == ["uuid"]
+
+
+def test_sortable_ids() -> None:
+    ids = [get_sortable_id() for _ in range(1000)] + get_sortable_ids(1000)
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    assert all(len(value) == 32 for value in ids)
+
+    parsed = uuid.UUID(ids[0])
+    assert parsed.version == 7 and parsed.variant == uuid.RFC_4122
+    assert abs(sortable_id_time(ids[-1]) - time.time()) < 5
+    assert get_sortable_ids(0) == []
+
+
+def test_sortable_ids_threads() -> None:
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        batches = list(pool.map(get_sortable_ids, [500] * 20))
+    ids = [value for batch in batches for value in batch]
+    assert len(set(ids)) == len(ids)
+    assert all(batch == sorted(batch) for batch in batches)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_sortable_ids_fork() -> None:
+    """Forked children do not wait on locks held in the parent."""
+    with plexiglass_uuid._PATH_LOCK, plexiglass_uuid._SORTABLE_LOCK:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                # Fail rather than hang the test run.
+                signal.alarm(5)
+                get_sortable_id()
+                with TemporaryDirectory() as tmpdir:
+                    get_uuid(Path(tmpdir) / "uuid")
+                code = 0
+            finally:
+                os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0